@@ -5,4 +5,27 @@ from logging import NullHandler
 
 logging.getLogger(__name__).addHandler(NullHandler())
 
+# Name of the handler installed by `configure_logging`
+_HANDLER_NAME = "red_panda.configure_logging"
+
+
+def configure_logging(level: int = logging.INFO):
+    """Opt in to printing red-panda logs, such as the queries planned with `dryrun=True`.
+
+    Calling it again only updates the level, so logs are never printed twice.
+
+    Args:
+        level (optional): Logging level of the `red_panda` logger. Default is `logging.INFO`.
+    """
+    logger = logging.getLogger(__name__)
+    if not any(h.get_name() == _HANDLER_NAME for h in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.set_name(_HANDLER_NAME)
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+        )
+        logger.addHandler(handler)
+    logger.setLevel(level)
+
+
 from red_panda.red_panda import RedPanda
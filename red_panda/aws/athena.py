@@ -1,5 +1,11 @@
-from multiprocessing import Value
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from typing import Callable, Tuple
+
 from pyathena import connect
+from pyathena.cursor import Cursor
+from pyathena.pandas_cursor import PandasCursor
 from pyathena.util import as_pandas
 
 from red_panda.typing import AthenaQueryResult
@@ -10,6 +16,39 @@ import logging
 
 LOGGER = logging.getLogger(__name__)
 
+ATHENA_CACHE_SIZE = 50
+
+
+@lru_cache(maxsize=64)
+def _make_row_dict(col_names: Tuple[str, ...]) -> Callable[[tuple], dict]:
+    """Create a function that turns a result row into a `dict` keyed by column name.
+
+    Cached per schema so repeated queries with the same columns reuse the same function.
+
+    Args:
+        col_names: Column names of the result set, in order.
+
+    Returns:
+        A function mapping a row tuple to a `dict`.
+    """
+    return lambda row: dict(zip(col_names, row))
+
+
+@lru_cache(maxsize=64)
+def _make_row_namedtuple(col_names: Tuple[str, ...]) -> Callable[[tuple], tuple]:
+    """Create a function that turns a result row into a `namedtuple` with column name fields.
+
+    The `namedtuple` type is created once per schema. Column names that are not valid
+    identifiers are renamed to positional names such as `_0`.
+
+    Args:
+        col_names: Column names of the result set, in order.
+
+    Returns:
+        A function mapping a row tuple to a `namedtuple`.
+    """
+    return namedtuple("Row", col_names, rename=True)._make
+
 
 class AthenaUtils(AWSUtils):
     """AWS Athena operations.
@@ -17,15 +56,26 @@ class AthenaUtils(AWSUtils):
     Args:
         aws_config: AWS configuration.
         s3_staging_dir: Full S3 folder uri, i.e. s3://athena-query/results.
-        region_name: AWS region name.
+        work_group (optional): Athena work group.
+        region_name (optional): AWS region name.
+        use_cache (optional): Whether queries reuse cached results by default. Requires
+            `work_group`.
+        arraysize (optional): Number of rows fetched per request to Athena, at most 1000.
+            Defaults to the pyathena default.
+        cursor_class (optional): pyathena cursor class. Use `pyathena.pandas_cursor.PandasCursor`
+            to read results from S3 in bulk, which is much faster for large results.
 
     Attributes:
         aws_config: AWS configuration.
-        s3_staging_dir: Full S3 folder uri, i.e. s3://athena-query/results.
-        region_name: AWS region name.
+        work_group: Athena work group.
+        use_cache: Whether queries reuse cached results by default.
+        cursor: The pyathena cursor.
+
+    Raises:
+        ValueError: If `use_cache` is True but `work_group` is not specified.
 
     TODO:
-        * Complete Support for other cursor types.
+        * Support for asynchronous cursor types.
         * Full parameters on `connect`.
     """
 
@@ -35,44 +85,67 @@ class AthenaUtils(AWSUtils):
         s3_staging_dir: dict,
         work_group: str = None,
         region_name: str = None,
+        use_cache: bool = False,
+        arraysize: int = None,
+        cursor_class: type = Cursor,
     ):
         super().__init__(aws_config=aws_config)
+        if use_cache and work_group is None:
+            raise ValueError("Workgroup must be specified to use cache.")
         self.work_group = work_group
+        self.use_cache = use_cache
         self.cursor = connect(
-            aws_access_key_id=self.aws_config.get("aws_access_key_id"),
-            aws_secret_access_key=self.aws_config.get("aws_secret_access_key"),
             s3_staging_dir=s3_staging_dir,
             work_group=work_group,
-            region_name=region_name or aws_config.get("region_name"),
+            region_name=region_name or self.aws_config.get("region_name"),
+            cursor_class=cursor_class,
+            **self._get_aws_credentials(),
         ).cursor()
+        if arraysize is not None:
+            self.cursor.arraysize = arraysize
 
     def run_query(
-        self, sql: str, as_df: bool = False, use_cache: bool = False
+        self,
+        sql: str,
+        as_df: bool = False,
+        use_cache: bool = None,
+        as_namedtuple: bool = False,
     ) -> AthenaQueryResult:
         """Run query on Athena.
 
         Args:
             sql: SQL query.
             as_df (optional): Whether to return the result as DataFrame.
+            use_cache (optional): Whether to reuse cached results. Defaults to `use_cache` of the
+                instance.
+            as_namedtuple (optional): Whether to return rows as `namedtuple`s instead of `dict`s.
+                Named tuples take less memory per row and support `_asdict()`.
 
         Returns:
-            Query result as DataFrame or List[Tuple].
+            Query result as DataFrame or a list of rows.
+
+        Raises:
+            ValueError: If `use_cache` is True but the instance has no `work_group`.
         """
-        cache_size = 0
-        if use_cache:
-            if self.work_group is None:
-                raise ValueError("Workgroup must be specified to use cache.")
-            cache_size = 50
+        if use_cache is None:
+            use_cache = self.use_cache
+        elif use_cache and self.work_group is None:
+            raise ValueError("Workgroup must be specified to use cache.")
+        cache_size = ATHENA_CACHE_SIZE if use_cache else 0
         self.cursor.execute(sql, cache_size=cache_size)
 
         if as_df:
+            if isinstance(self.cursor, PandasCursor):
+                return self.cursor.as_pandas()
             return as_pandas(self.cursor)
 
+        col_names = tuple(sys.intern(c[0]) for c in self.cursor.description)
+        make_row = (
+            _make_row_namedtuple(col_names)
+            if as_namedtuple
+            else _make_row_dict(col_names)
+        )
         res = []
-        desc = self.cursor.description
-        for row in self.cursor:
-            r = {}
-            for i, c in enumerate(desc):
-                r[c[0]] = row[i]
-            res.append(r)
+        for rows in iter(self.cursor.fetchmany, []):
+            res.extend(map(make_row, rows))
         return res
@@ -1,8 +1,14 @@
 import logging
-from typing import Union, Optional, List
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Union, Optional, List, Iterator, Iterable
 
 import pandas as pd
 import psycopg2
+from psycopg2.extensions import make_dsn
+from psycopg2.extras import execute_batch
+from psycopg2.pool import ThreadedConnectionPool
 
 from red_panda.typing import QueryResult, TemplateQueryResult
 from red_panda.pandas import PANDAS_TOCSV_KWARGS
@@ -15,12 +21,62 @@ from red_panda.aws.templates.redshift import (
     SQL_LOCK_INFO,
     SQL_TRANSACT_INFO,
 )
-from red_panda.utils import filter_kwargs, prettify_sql
+from red_panda.utils import filter_kwargs, prettify_sql, split_sql
 
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _log_query(sql: str):
+    """Log a query, skipping the cost of prettifying it when INFO logs are discarded."""
+    if LOGGER.isEnabledFor(logging.INFO):
+        LOGGER.info(prettify_sql(sql))
+
+
+def _format_default(default) -> str:
+    quote = "'" if not isinstance(default, (int, float, complex)) else ""
+    return f"default {quote}{default}{quote}"
+
+
+# (key, formatter) pairs in the order options appear in a column definition. Each formatter
+# returns the option string, or None if the option should be left out.
+_COLUMN_OPTIONS = (
+    ("data_type", lambda v: v if v is not None else "varchar(256)"),
+    ("default", lambda v: _format_default(v) if v is not None else None),
+    ("identity", lambda v: f"identity({v[0]}, {v[1]})" if v is not None else None),
+    ("encode", lambda v: f"encode {v}" if v is not None else None),
+    ("distkey", lambda v: "distkey" if v else None),
+    ("sortkey", lambda v: "sortkey" if v else None),
+    ("nullable", lambda v: "not null" if v is not None and not v else None),
+    ("unique", lambda v: "unique" if v else None),
+    ("primary_key", lambda v: "primary key" if v else None),
+    ("references", lambda v: f"references {v}" if v is not None else None),
+    ("like", lambda v: f"like {v}" if v is not None else None),
+)
+
+
+@lru_cache(maxsize=None)
+def _column_option_formatters(keys: frozenset) -> tuple:
+    """Formatters of the options present in a column definition with the given keys."""
+    return tuple(
+        (key, format_option)
+        for key, format_option in _COLUMN_OPTIONS
+        if key == "data_type" or key in keys
+    )
+
+
+def _intern_strings(data: Optional[list]) -> Optional[list]:
+    """Share a single object per distinct string in fetched rows.
+
+    Catalog queries repeat the same schema names, styles and encodings on every row.
+    """
+    if data is None:
+        return data
+    return [
+        tuple(sys.intern(c) if isinstance(c, str) else c for c in row) for row in data
+    ]
+
+
 def create_column_definition_single(d: dict) -> str:
     """Create the column definition for a single column.
 
@@ -45,68 +101,109 @@ def create_column_definition_single(d: dict) -> str:
     Returns:
         str: Single column definition for Redshift.
     """
-    data_type = d.get("data_type")
-    data_type_option = data_type if data_type is not None else "varchar(256)"
-    default = d.get("default")
-    quote = "'" if not isinstance(default, (int, float, complex)) else ""
-    default_option = f"default {quote}{default}{quote}" if default is not None else ""
-    identity = d.get("identity")
-    if identity is not None:
-        seed, step = identity
-        identity_option = f"identity({seed}, {step})"
-    else:
-        identity_option = ""
-    encode = d.get("encode")
-    encode_option = f"encode {encode}" if encode is not None else ""
-    distkey = d.get("distkey")
-    distkey_option = "distkey" if distkey is not None and distkey else ""
-    sortkey = d.get("sortkey")
-    sortkey_option = "sortkey" if sortkey is not None and sortkey else ""
-    nullable = d.get("nullable")
-    nullable_option = "not null" if nullable is not None and not nullable else ""
-    unique = d.get("unique")
-    unique_option = "unique" if unique is not None and unique else ""
-    primary_key = d.get("primary_key")
-    primary_key_option = (
-        "primary key" if primary_key is not None and primary_key else ""
+    options = (
+        format_option(d.get(key))
+        for key, format_option in _column_option_formatters(frozenset(d))
     )
-    references = d.get("references")
-    references_option = f"references {references}" if references is not None else ""
-    like = d.get("like")
-    like_option = f"like {like}" if like is not None else ""
-    template = " ".join(
-        [
-            data_type_option,
-            default_option,
-            identity_option,
-            encode_option,
-            distkey_option,
-            sortkey_option,
-            nullable_option,
-            unique_option,
-            primary_key_option,
-            references_option,
-            like_option,
-        ]
-    )
-    return " ".join(template.split())
+    return " ".join(option for option in options if option)
 
 
 def create_column_definition(d: dict) -> str:
     """Create full column definition string for Redshift.
 
     Args:
-        d: A `dict` if single column definitions, where the keys are column names.
+        d: A `dict` if single column definitions, where the keys are column names. A column
+            definition of None uses the defaults.
 
     Returns:
         str: Full column definition for Redshift.
     """
-    return ",\n".join(f"{c} {create_column_definition_single(o)}" for c, o in d.items())
+    # Value types are part of the key, as e.g. defaults of 1, 1.0 and True are equal
+    columns = tuple(
+        (c, tuple((k, type(v), v) for k, v in (o or {}).items())) for c, o in d.items()
+    )
+    try:
+        return _create_column_definition(columns)
+    except TypeError:
+        # Unhashable option values, e.g. lists, cannot be cached
+        return _create_column_definition.__wrapped__(columns)
+
+
+@lru_cache(maxsize=128)
+def _create_column_definition(columns: tuple) -> str:
+    """Cached `create_column_definition` of `(column name, option items)` pairs.
+
+    Loads that run repeatedly with the same schema reuse the definition.
+    """
+    return ",\n".join(
+        [
+            f"{c} {create_column_definition_single({k: v for k, _, v in o})}"
+            for c, o in columns
+        ]
+    )
+
+
+class LazyRedshiftResult:
+    """A query result that is only fetched from Redshift when needed.
+
+    Column selection and `head` are pushed down to Redshift as a projection and a `limit`, so
+    only the requested columns and rows are transferred.
+
+    Args:
+        sql: SQL query.
+        redshift_utils: `RedshiftUtils` used to run the query.
+
+    Attributes:
+        sql (str): SQL query.
+
+    Example:
+        >>> info = redshift_utils.get_table_info(as_df="lazy")
+        >>> info[["schema", "table"]].head(10)
+    """
+
+    __slots__ = ("sql", "_redshift_utils")
+
+    def __init__(self, sql: str, redshift_utils: "RedshiftUtils"):
+        self.sql = sql
+        self._redshift_utils = redshift_utils
+
+    def __getitem__(self, columns: Union[str, List[str]]) -> "LazyRedshiftResult":
+        if isinstance(columns, str):
+            columns = [columns]
+        sql = f"select {', '.join(columns)} from ({self.sql}) t"
+        return LazyRedshiftResult(sql, self._redshift_utils)
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Fetch the first `n` rows.
+
+        Args:
+            n (optional): Number of rows.
+
+        Returns:
+            pandas.DataFrame: The first `n` rows of the result.
+        """
+        return self._redshift_utils.redshift_to_df(
+            f"select * from ({self.sql}) t limit {int(n)}"
+        )
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Fetch the full result.
+
+        Returns:
+            pandas.DataFrame: The query result.
+        """
+        return self._redshift_utils.redshift_to_df(self.sql)
 
 
 class RedshiftUtils:
     """ Base class for Redshift operations.
 
+    Connections are pooled and reused across queries. The pool is created on the first query
+    and holds at most `redshift_config["maxconn"]` connections (default 5). Call `close` to
+    close all pooled connections. Connecting times out after
+    `redshift_config["connect_timeout"]` seconds (default 10), and TCP keepalives are sent so
+    idle pooled connections are not dropped.
+
     Args:
         redshift_conf: Redshift configuration.
         dryrun (optional): If True, queries will be printed instead of executed.
@@ -118,41 +215,90 @@ class RedshiftUtils:
     def __init__(self, redshift_config: dict, dryrun: bool = False):
         self.redshift_config = redshift_config
         self._dryrun = dryrun
+        self._pool = None
+        self._n_slices = None
+        self._dsn = make_dsn(
+            user=redshift_config.get("user"),
+            password=redshift_config.get("password"),
+            host=redshift_config.get("host"),
+            port=redshift_config.get("port"),
+            dbname=redshift_config.get("dbname"),
+            connect_timeout=redshift_config.get("connect_timeout", 10),
+            keepalives=1,
+            keepalives_idle=30,
+        )
 
     def _connect_redshift(self):
-        return psycopg2.connect(
-            user=self.redshift_config.get("user"),
-            password=self.redshift_config.get("password"),
-            host=self.redshift_config.get("host"),
-            port=self.redshift_config.get("port"),
-            dbname=self.redshift_config.get("dbname"),
+        if self._pool is None:
+            self._pool = ThreadedConnectionPool(
+                1, self.redshift_config.get("maxconn", 5), self._dsn
+            )
+        return self._pool.getconn()
+
+    def _release_redshift(self, conn):
+        """Return a connection to the pool, which rolls back any open transaction.
+
+        Closed or broken connections are discarded instead of being handed to the next caller.
+        """
+        broken = (
+            conn.closed
+            or conn.get_transaction_status()
+            == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
         )
+        self._pool.putconn(conn, close=bool(broken))
+
+    def close(self):
+        """Close all pooled Redshift connections."""
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
 
     def run_sql_from_file(self, file_name: str):
         """Run a `.sql` file.
 
+        The file is read and split into statements lazily, and the statements are run one at a
+        time on a single connection in one transaction.
+
         Args:
             file_name: SQL file to be run.
-
-        TODO:
-            * Add support for transactions.
         """
         with open(file_name, "r") as f:
-            sql = f.read()
-        self.run_query(sql)
-
-    def run_query(self, sql: str, fetch: bool = False) -> QueryResult:
+            statements = split_sql(f)
+            if self._dryrun:
+                for sql in statements:
+                    _log_query(sql)
+                return
+
+            conn = self._connect_redshift()
+            try:
+                cursor = conn.cursor()
+                for sql in statements:
+                    _log_query(sql)
+                    cursor.execute(sql)
+                conn.commit()
+            except KeyboardInterrupt:
+                conn.cancel()
+                conn.rollback()
+                LOGGER.warning("User canceled query.")
+            finally:
+                self._release_redshift(conn)
+
+    def run_query(
+        self, sql: str, fetch: bool = False, params: Iterable = None
+    ) -> QueryResult:
         """Run a SQL query.
 
         Args:
             sql: SQL string.
             fetch (optional): Whether to return data from the query.
+            params (optional): Parameters for `%s` placeholders in `sql`, passed to the driver
+                instead of being formatted into the SQL string.
 
         Returns:
             Tuple[dict, list]: (data, columns) where data is a json/dict representation of the data 
             and columns is a list of column names.
         """
-        LOGGER.info(prettify_sql(sql))
+        _log_query(sql)
 
         if self._dryrun:
             return (None, None)
@@ -162,7 +308,7 @@ class RedshiftUtils:
         columns = None
         data = None
         try:
-            cursor.execute(sql)
+            cursor.execute(sql, params)
             if fetch:
                 if cursor.description is not None:
                     columns = [desc[0] for desc in cursor.description]
@@ -173,11 +319,73 @@ class RedshiftUtils:
                 conn.commit()
         except KeyboardInterrupt:
             conn.cancel()
+            conn.rollback()
             LOGGER.warning("User canceled query.")
         finally:
-            conn.close()
+            self._release_redshift(conn)
         return (data, columns)
 
+    def run_many(self, sql: str, argslist: Iterable[tuple], page_size: int = 100):
+        """Run a parameterized SQL statement for each set of parameters, in batches.
+
+        Statements are sent `page_size` at a time with `psycopg2.extras.execute_batch`, instead of
+        one round trip per set of parameters, and committed together.
+
+        Args:
+            sql: SQL string with `%s` placeholders.
+            argslist: Parameters for each execution of `sql`.
+            page_size (optional): Number of statements sent per round trip.
+        """
+        _log_query(sql)
+
+        if self._dryrun:
+            return
+
+        conn = self._connect_redshift()
+        cursor = conn.cursor()
+        try:
+            execute_batch(cursor, sql, argslist, page_size=page_size)
+            conn.commit()
+        except KeyboardInterrupt:
+            conn.cancel()
+            conn.rollback()
+            LOGGER.warning("User canceled query.")
+        finally:
+            self._release_redshift(conn)
+
+    def run_query_chunked(
+        self, sql: str, chunksize: int = 10000
+    ) -> Iterator[QueryResult]:
+        """Run a SQL query and fetch the result in chunks with a server-side cursor.
+
+        Only one chunk of rows is held in memory at a time, instead of the full result set.
+
+        Args:
+            sql: SQL string.
+            chunksize (optional): Number of rows per chunk.
+
+        Yields:
+            Tuple[list, list]: (data, columns) for each chunk of at most `chunksize` rows. At
+            least one (possibly empty) chunk is yielded for a query that returns data.
+        """
+        _log_query(sql)
+
+        if self._dryrun:
+            return
+
+        conn = self._connect_redshift()
+        try:
+            with conn.cursor(name="red_panda_chunked") as cursor:
+                cursor.itersize = chunksize
+                cursor.execute(sql)
+                data = cursor.fetchmany(chunksize)
+                columns = [desc[0] for desc in cursor.description]
+                yield (data, columns)
+                for data in iter(lambda: cursor.fetchmany(chunksize), []):
+                    yield (data, columns)
+        finally:
+            self._release_redshift(conn)
+
     def cancel_query(self, pid: Union[str, int], transaction: bool = False):
         """Cancels a running query given pid.
 
@@ -185,7 +393,7 @@ class RedshiftUtils:
             pid: PID of a running query in Redshift.
             transaction (optional): Whether the running query is a transaction.
         """
-        self.run_query(f"cancel {pid}")
+        self.run_query("cancel %s", params=(int(pid),))
         if transaction:
             self.run_query("abort")
 
@@ -195,42 +403,113 @@ class RedshiftUtils:
         Args:
             pid: PID of a running query in Redshift.
         """
-        self.run_query(f"select pg_terminate_backend({pid})")
+        self.run_query("select pg_terminate_backend(%s)", params=(int(pid),))
+
+    def invalidate_cache(self):
+        """Clear cached cluster information, e.g. after the cluster has been resized."""
+        self._n_slices = None
 
     def get_num_slices(self) -> Optional[int]:
         """Get number of slices of a Redshift cluster.
-        
+
+        The number of slices is only queried once and then cached on the instance, see
+        `invalidate_cache`.
+
         Returns:
             int: Number of slices of the connected cluster.
 
         Raises:
             IndexError: When Redshift returns invalid number of slices.
         """
+        if self._n_slices is not None:
+            return self._n_slices
         data, _ = self.run_query(SQL_NUM_SLICES, fetch=True)
-        n_slices = None
         try:
-            n_slices = data[0][0]
+            self._n_slices = data[0][0]
         except IndexError:
             LOGGER.error("Could not derive number of slices of Redshift cluster.")
-        return n_slices
+        return self._n_slices
 
-    def run_template(self, sql: str, as_df: bool = True) -> TemplateQueryResult:
+    def run_template(
+        self, sql: str, as_df: Union[bool, str] = True
+    ) -> TemplateQueryResult:
         """Utility method to run a pre-defined sql template.
 
         Args:
             sql: SQL string.
-            as_df (optional): Whether or not to return the result as a `pandas.DataFrame`.
+            as_df (optional): Whether or not to return the result as a `pandas.DataFrame`. If
+                "lazy", return a `LazyRedshiftResult` that runs the query only when needed.
 
         Returns:
-            Union[pandas.DataFrame, Tuple[dict, list]]: Either return a DataFrame/table of the 
-            template query result or the raw form as specified in `run_query`.
+            Union[pandas.DataFrame, Tuple[dict, list], LazyRedshiftResult]: Either return a
+            DataFrame/table of the template query result, the raw form as specified in
+            `run_query` or the lazy result.
         """
+        if as_df == "lazy":
+            return LazyRedshiftResult(sql, self)
         data, columns = self.run_query(sql, fetch=True)
+        data = _intern_strings(data)
         if as_df:
             return pd.DataFrame(data, columns=columns)
         else:
             return (data, columns)
 
+    def run_templates(
+        self, sqls: List[str], as_df: bool = True
+    ) -> List[TemplateQueryResult]:
+        """Utility method to run several pre-defined sql templates on a single connection.
+
+        Args:
+            sqls: SQL strings.
+            as_df (optional): Whether or not to return the results as `pandas.DataFrame`s.
+
+        Returns:
+            List[Union[pandas.DataFrame, Tuple[dict, list]]]: The result of each template, in the
+            same order as `sqls`, in the form specified in `run_template`.
+        """
+        for sql in sqls:
+            _log_query(sql)
+
+        if self._dryrun:
+            results = [(None, None)] * len(sqls)
+        else:
+            results = []
+            conn = self._connect_redshift()
+            try:
+                cursor = conn.cursor()
+                for sql in sqls:
+                    cursor.execute(sql)
+                    columns = [desc[0] for desc in cursor.description]
+                    results.append((_intern_strings(cursor.fetchall()), columns))
+            finally:
+                self._release_redshift(conn)
+        if as_df:
+            return [pd.DataFrame(data, columns=columns) for data, columns in results]
+        else:
+            return results
+
+    def get_cluster_diagnostics(self, as_df: bool = True) -> dict:
+        """Utility to get all diagnostic information of the cluster on a single connection.
+
+        Args:
+            as_df (optional): Whether or not to return the results as `pandas.DataFrame`s.
+
+        Returns:
+            dict: Results keyed by `table_info`, `load_errors`, `running_info`, `lock_info` and
+            `transaction_info`.
+        """
+        templates = OrderedDict(
+            [
+                ("table_info", SQL_TABLE_INFO),
+                ("load_errors", SQL_LOAD_ERRORS),
+                ("running_info", SQL_RUNNING_INFO),
+                ("lock_info", SQL_LOCK_INFO),
+                ("transaction_info", SQL_TRANSACT_INFO),
+            ]
+        )
+        results = self.run_templates(list(templates.values()), as_df)
+        return OrderedDict(zip(templates, results))
+
     def get_table_info(
         self, as_df: bool = True, simple: bool = False
     ) -> TemplateQueryResult:
@@ -290,29 +569,55 @@ class RedshiftUtils:
         """
         return self.run_template(SQL_TRANSACT_INFO, as_df)
 
-    def redshift_to_df(self, sql: str) -> pd.DataFrame:
+    def redshift_to_df(self, sql: str, chunksize: int = None) -> pd.DataFrame:
         """Redshift query result to a Pandas DataFrame.
 
         Args:
             sql: SQL query.
+            chunksize (optional): If given, fetch the result in chunks of this many rows with a
+                server-side cursor, so the raw rows of the full result are never held at once.
 
         Returns:
             pandas.DataFrame: A DataFrame of query result.
         """
-        data, columns = self.run_query(sql, fetch=True)
-        return pd.DataFrame(data, columns=columns)
+        if chunksize is None:
+            data, columns = self.run_query(sql, fetch=True)
+            return pd.DataFrame(data, columns=columns)
+        frames = [
+            pd.DataFrame(data, columns=columns)
+            for data, columns in self.run_query_chunked(sql, chunksize)
+        ]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True, copy=False)
 
-    def redshift_to_file(self, sql: str, file_name: str, **kwargs):
+    def redshift_to_file(
+        self, sql: str, file_name: str, chunksize: int = None, **kwargs
+    ):
         """Redshift query result to a file.
 
         Args:
             sql: SQL query.
             file_name: File name of the saved file.
+            chunksize (optional): If given, stream the result to the file in chunks of this many
+                rows with a server-side cursor instead of loading it into one DataFrame first.
             **kwargs: `to_csv` keyword arguments.
         """
-        data = self.redshift_to_df(sql)
         to_csv_kwargs = filter_kwargs(kwargs, PANDAS_TOCSV_KWARGS)
-        data.to_csv(file_name, **to_csv_kwargs)
+        if chunksize is None:
+            data = self.redshift_to_df(sql)
+            data.to_csv(file_name, **to_csv_kwargs)
+            return
+        mode = to_csv_kwargs.pop("mode", "w")
+        header = to_csv_kwargs.pop("header", True)
+        n_rows = 0
+        for data, columns in self.run_query_chunked(sql, chunksize):
+            index = pd.RangeIndex(n_rows, n_rows + len(data))
+            pd.DataFrame(data, columns=columns, index=index).to_csv(
+                file_name, mode=mode, header=header, **to_csv_kwargs
+            )
+            mode, header = "a", False
+            n_rows += len(data)
 
     def create_table(
         self,
@@ -393,17 +698,21 @@ class RedshiftUtils:
         sortkey_option = (
             f'{sortstyle} sortkey({", ".join(sortkey)})' if sortkey is not None else ""
         )
-        create_template = f"""\
-        create table {temp_option} {table_name} {exist_option} (
-        {create_column_definition(column_definition)}
+        table_option = " ".join(
+            o for o in ("create table", temp_option, table_name, exist_option) if o
         )
-        backup {backup}
-        diststyle {diststyle}
-        {unique_option}
-        {primary_key_option}
-        {foreign_key_option}
-        {references_option}
-        {distkey_option}
-        {sortkey_option}
-        """
+        clauses = [
+            f"{table_option} (",
+            create_column_definition(column_definition),
+            ")",
+            f"backup {backup}",
+            f"diststyle {diststyle}",
+            unique_option,
+            primary_key_option,
+            foreign_key_option,
+            references_option,
+            distkey_option,
+            sortkey_option,
+        ]
+        create_template = "\n".join(c for c in clauses if c)
         self.run_query(create_template)
@@ -1,9 +1,15 @@
 import warnings
-from io import StringIO, BytesIO
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, BufferedReader, RawIOBase
+from operator import itemgetter
+from typing import Iterator
 import logging
 
 import pandas as pd
-import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from boto3.s3.transfer import S3Transfer, TransferConfig
 
 from red_panda.pandas import PANDAS_TOCSV_KWARGS, PANDAS_READ_TABLE_KWARGS
 from red_panda.aws import (
@@ -11,38 +17,136 @@ from red_panda.aws import (
     S3_GET_KWARGS,
     S3_CREATE_BUCKET_KWARGS,
 )
-from red_panda.utils import filter_kwargs, make_valid_uri
+from red_panda.utils import filter_kwargs, partition_kwargs, make_valid_uri
 from red_panda.aws import AWSUtils
 
 
 LOGGER = logging.getLogger(__name__)
 
+S3_DELETE_BATCH_SIZE = 1000
+# Enough pooled connections for concurrent folder reads and multipart transfers
+S3_MAX_POOL_CONNECTIONS = 32
+# Number of DataFrame rows encoded to CSV at a time when streaming uploads
+CSV_CHUNK_ROWS = 10000
+# `to_csv` keyword arguments the pyarrow CSV writer can handle
+PYARROW_TOCSV_KWARGS = frozenset({"sep", "header", "index", "columns"})
+# Fast gzip level for intermediate files, the upload dominates the cost
+CSV_GZIP_LEVEL = 1
+
+
+class _ChunkReader(RawIOBase):
+    """Read-only file-like over an iterator of `bytes` chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._chunk:
+            try:
+                self._chunk = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._chunk))
+        b[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+
+def _iter_csv_chunks(df: pd.DataFrame, **kwargs) -> Iterator[bytes]:
+    """Encode `df` to CSV `CSV_CHUNK_ROWS` rows at a time, writing the header only once."""
+    encoding = kwargs.pop("encoding", None) or "utf-8"
+    kwargs.pop("path_or_buf", None)
+    header = kwargs.pop("header", True)
+    for start in range(0, max(len(df), 1), CSV_CHUNK_ROWS):
+        chunk = df.iloc[start : start + CSV_CHUNK_ROWS]
+        chunk_header = header if start == 0 else False
+        yield chunk.to_csv(header=chunk_header, **kwargs).encode(encoding)
+
+
+def _iter_arrow_csv_chunks(
+    df: pd.DataFrame,
+    sep: str = ",",
+    header: bool = True,
+    index: bool = True,
+    columns: list = None,
+) -> Iterator[bytes]:
+    """Encode `df` to CSV with `pyarrow.csv`, `CSV_CHUNK_ROWS` rows at a time."""
+    import pyarrow as pa
+    from pyarrow import csv
+
+    if columns is not None:
+        df = df[list(columns)]
+    if index:
+        names = ["" if name is None else name for name in df.index.names]
+        df = df.reset_index()
+        df.columns = [*names, *df.columns[len(names) :]]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = BytesIO()
+    writer = csv.CSVWriter(
+        sink,
+        table.schema,
+        write_options=csv.WriteOptions(include_header=header, delimiter=sep),
+    )
+    for batch in table.to_batches(max_chunksize=CSV_CHUNK_ROWS):
+        writer.write_batch(batch)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+
+def _gzip_chunks(
+    chunks: Iterator[bytes], level: int = CSV_GZIP_LEVEL
+) -> Iterator[bytes]:
+    """Compress an iterator of `bytes` chunks into a single gzip stream."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk)
+    yield compressor.flush()
+
 
 class S3Utils(AWSUtils):
     """AWS S3 operations.
 
     Args:
         aws_config: AWS configuration.
+        transfer_config (optional): Default `boto3.s3.transfer.TransferConfig` of file and
+            DataFrame transfers, e.g. with larger parts and more threads for large files.
 
     Attributes:
         aws_config (dict): AWS configuration.
+        transfer_config (TransferConfig): Default transfer configuration.
     """
 
-    def __init__(self, aws_config: dict):
+    def __init__(self, aws_config: dict, transfer_config: TransferConfig = None):
         super().__init__(aws_config=aws_config)
+        self.transfer_config = transfer_config
+        self._s3 = None
 
     def _connect_s3(self):
         """Get S3 session.
 
+        The resource is created on first use and reused afterwards, so all operations share one
+        connection pool. The pool holds `aws_config["max_pool_connections"]` connections (default
+        32), and throttled or failed requests are retried up to 5 times.
+
         If key/secret are not provided, boto3's default behavior is falling back to awscli configs
         and environment variables.
         """
-        return boto3.resource(
-            "s3",
-            aws_access_key_id=self.aws_config.get("aws_access_key_id"),
-            aws_secret_access_key=self.aws_config.get("aws_secret_access_key"),
-            aws_session_token=self.aws_config.get("aws_session_token"),
-        )
+        if self._s3 is None:
+            config = Config(
+                max_pool_connections=self.aws_config.get(
+                    "max_pool_connections", S3_MAX_POOL_CONNECTIONS
+                ),
+                retries={"mode": "standard", "max_attempts": 5},
+            )
+            self._s3 = self._get_aws_session().resource("s3", config=config)
+        return self._s3
 
     def _check_s3_bucket_existence(self, bucket: str) -> bool:
         s3 = self.get_s3_client()
@@ -67,11 +171,7 @@ class S3Utils(AWSUtils):
             return True
 
     def _get_s3_pattern_existence(self, bucket: str, pattern: str) -> list:
-        s3 = self.get_s3_resource()
-        all_keys = [
-            o.key for o in s3.Bucket(bucket).objects.all() if o.key.startswith(pattern)
-        ]
-        return all_keys
+        return self.list_object_keys(bucket, pattern)
 
     def get_s3_resource(self):
         """Return a boto3 S3 resource"""
@@ -89,22 +189,33 @@ class S3Utils(AWSUtils):
         """
         s3 = self.get_s3_client()
         response = s3.list_buckets()
-        buckets = [bucket["Name"] for bucket in response["Buckets"]]
+        buckets = list(map(itemgetter("Name"), response["Buckets"]))
         return buckets
 
-    def list_object_keys(self, bucket: str, prefix: str = "") -> list:
+    def list_object_keys(
+        self, bucket: str, prefix: str = "", page_size: int = None
+    ) -> list:
         """List all object keys.
 
+        Keys are filtered by prefix on S3's side and listed page by page, so there is no limit on
+        the number of keys returned.
+
         Args:
             bucket: Bucket name.
             prefix: Any prefix for the object.
+            page_size (optional): Number of keys requested per page. Default is 1000.
 
         Returns:
             A list of all objects in a bucket given certain prefix.
         """
         s3 = self.get_s3_client()
-        response = s3.list_objects(Bucket=bucket, Prefix=prefix)
-        return [o["Key"] for o in response["Contents"]]
+        paginator = s3.get_paginator("list_objects_v2")
+        pagination_config = {"PageSize": page_size} if page_size is not None else {}
+        pages = paginator.paginate(
+            Bucket=bucket, Prefix=prefix, PaginationConfig=pagination_config
+        )
+        get_key = itemgetter("Key")
+        return [k for page in pages for k in map(get_key, page.get("Contents", ()))]
 
     def create_bucket(self, bucket: str, error: str = "warn", **kwargs):
         """Check and create bucket.
@@ -127,51 +238,166 @@ class S3Utils(AWSUtils):
         extra_kwargs = filter_kwargs(kwargs, S3_CREATE_BUCKET_KWARGS)
         return s3.create_bucket(Bucket=bucket, **extra_kwargs)
 
-    def file_to_s3(self, file_name: str, bucket: str, key: str, **kwargs):
+    def file_to_s3(
+        self,
+        file_name: str,
+        bucket: str,
+        key: str,
+        verify_bucket: bool = False,
+        transfer_config: TransferConfig = None,
+        **kwargs,
+    ):
         """Put a file to S3.
 
         Args:
             file_name: Local file name.
             bucket: S3 bucket name.
             key: S3 key.
+            verify_bucket (optional): If True, warn first when the bucket does not exist or is
+                not accessible. This costs an extra request per call, so leave it off when
+                uploading many objects. The upload itself raises in either case.
+            transfer_config (optional): `boto3.s3.transfer.TransferConfig` for the transfer, e.g.
+                to raise `max_concurrency` of multipart transfers of large files. Default is
+                `transfer_config` of the instance, or boto3's default configuration.
             **kwargs: ExtraArgs for `boto3.client.upload_file`.
         """
         s3 = self._connect_s3()
-        self._check_s3_bucket_existence(bucket)
+        if verify_bucket:
+            self._check_s3_bucket_existence(bucket)
         s3_put_kwargs = filter_kwargs(kwargs, S3_PUT_KWARGS)
         s3.meta.client.upload_file(
-            file_name, Bucket=bucket, Key=key, ExtraArgs=s3_put_kwargs
+            file_name,
+            Bucket=bucket,
+            Key=key,
+            ExtraArgs=s3_put_kwargs,
+            Config=transfer_config or self.transfer_config,
         )
 
-    def df_to_s3(self, df: pd.DataFrame, bucket: str, key: str, **kwargs):
+    def df_to_s3(
+        self,
+        df: pd.DataFrame,
+        bucket: str,
+        key: str,
+        verify_bucket: bool = False,
+        transfer_config: TransferConfig = None,
+        file_format: str = None,
+        csv_engine: str = None,
+        **kwargs,
+    ):
         """Put DataFrame to S3.
 
+        The CSV is encoded a few thousand rows at a time while it is uploaded with
+        `boto3.client.upload_fileobj`, in parallel parts for large frames, so the whole CSV is
+        never held in memory.
+
         Args:
             df: Source dataframe.
             bucket: S3 bucket name.
             key: S3 key.
-            **kwargs: kwargs for `boto3.Bucket.put_object` and `pandas.DataFrame.to_csv`.
+            verify_bucket (optional): If True, warn first when the bucket does not exist or is
+                not accessible. This costs an extra request per call, so leave it off when
+                uploading many objects. The upload itself raises in either case.
+            transfer_config (optional): `boto3.s3.transfer.TransferConfig` for the transfer, e.g.
+                to raise `max_concurrency` of multipart transfers of large files. Default is
+                `transfer_config` of the instance, or boto3's default configuration.
+            file_format (optional): CSV or PARQUET. Default is CSV. PARQUET needs pyarrow or
+                fastparquet, and only uses the `index` `to_csv` keyword argument. The index is
+                written as regular leading columns, named as in `DataFrame.reset_index`.
+            csv_engine (optional): pandas or pyarrow. Default is pandas. pyarrow's multithreaded
+                CSV writer is much faster for large frames, but formats some values differently,
+                e.g. booleans as `true`/`false`. It falls back to pandas for `to_csv` keyword
+                arguments other than sep, header, index and columns, and for MultiIndex columns.
+            **kwargs: kwargs for `boto3.client.upload_fileobj` ExtraArgs and
+                `pandas.DataFrame.to_csv`. With `compression="gzip"`, the CSV is gzipped while
+                it is streamed.
+
+        Raises:
+            ValueError: If file_format is not CSV or PARQUET, or csv_engine is not pandas or
+                pyarrow.
         """
+        if csv_engine not in (None, "pandas", "pyarrow"):
+            raise ValueError("CSV engine can only be pandas or pyarrow if specified.")
         s3 = self._connect_s3()
-        buffer = StringIO()
         to_csv_kwargs = filter_kwargs(kwargs, PANDAS_TOCSV_KWARGS)
-        df.to_csv(buffer, **to_csv_kwargs)
-        self._check_s3_bucket_existence(bucket)
-        s3_put_kwargs = filter_kwargs(kwargs, S3_PUT_KWARGS)
-        s3.Bucket(bucket).put_object(Key=key, Body=buffer.getvalue(), **s3_put_kwargs)
+        if file_format in (None, "CSV"):
+            gzipped = to_csv_kwargs.get("compression") == "gzip"
+            if gzipped:
+                del to_csv_kwargs["compression"]
+            if (
+                csv_engine == "pyarrow"
+                and PYARROW_TOCSV_KWARGS.issuperset(to_csv_kwargs)
+                and df.columns.nlevels == 1
+            ):
+                chunks = _iter_arrow_csv_chunks(df, **to_csv_kwargs)
+            else:
+                chunks = _iter_csv_chunks(df, **to_csv_kwargs)
+            if gzipped:
+                chunks = _gzip_chunks(chunks)
+            buffer = BufferedReader(_ChunkReader(chunks))
+        elif file_format == "PARQUET":
+            if to_csv_kwargs.get("index", True):
+                # Write the index as the first column(s), as in CSV, since pyarrow would write
+                # it last and Redshift COPY matches Parquet columns by position
+                df = df.reset_index()
+            buffer = BytesIO()
+            df.to_parquet(buffer, index=False)
+            buffer.seek(0)
+        else:
+            raise ValueError("File format can only be CSV or PARQUET if specified.")
+        if verify_bucket:
+            self._check_s3_bucket_existence(bucket)
+        s3_put_kwargs = filter_kwargs(
+            filter_kwargs(kwargs, S3_PUT_KWARGS), S3Transfer.ALLOWED_UPLOAD_ARGS
+        )
+        s3.meta.client.upload_fileobj(
+            buffer,
+            Bucket=bucket,
+            Key=key,
+            ExtraArgs=s3_put_kwargs,
+            Config=transfer_config or self.transfer_config,
+        )
 
-    def delete_from_s3(self, bucket: str, key: str):
+    def delete_from_s3(self, bucket: str, key: str, verify_key: bool = False):
         """Delete object from S3.
 
         Args:
             bucket: S3 bucket name.
             key: S3 key.
+            verify_key (optional): If True, check that the key exists first and warn instead of
+                deleting if it does not. This costs an extra request, as S3 deletes of missing
+                keys succeed anyway.
         """
-        s3 = self._connect_s3()
-        if self._check_s3_key_existence(bucket, key):
-            s3.meta.client.delete_object(Bucket=bucket, Key=key)
-        else:
+        s3 = self.get_s3_client()
+        if verify_key and not self._check_s3_key_existence(bucket, key):
             LOGGER.warning(f"{bucket}: {key} does not exist.")
+            return
+        try:
+            s3.delete_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            LOGGER.warning(f"{bucket}: {key} could not be deleted: {e}")
+
+    def delete_many_from_s3(self, bucket: str, keys: list):
+        """Delete objects from S3, up to 1000 keys per request.
+
+        Args:
+            bucket: S3 bucket name.
+            keys: S3 keys.
+        """
+        s3 = self.get_s3_client()
+        for i in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            response = s3.delete_objects(
+                Bucket=bucket,
+                Delete={
+                    "Objects": [
+                        {"Key": key} for key in keys[i : i + S3_DELETE_BATCH_SIZE]
+                    ],
+                    "Quiet": True,
+                },
+            )
+            for error in response.get("Errors", []):
+                LOGGER.warning(
+                    f"{bucket}: {error['Key']} could not be deleted: {error['Message']}"
+                )
 
     def delete_bucket(self, bucket: str):
         """Empty and delete bucket.
@@ -182,9 +408,8 @@ class S3Utils(AWSUtils):
         TODO:
             * Handle when there is bucket versioning.
         """
-        s3_bucket = self.get_s3_resource().Bucket(bucket)
-        s3_bucket.objects.all().delete()
-        s3_bucket.delete()
+        self.delete_many_from_s3(bucket, self.list_object_keys(bucket))
+        self.get_s3_client().delete_bucket(Bucket=bucket)
 
     def s3_to_obj(self, bucket: str, key: str, **kwargs) -> BytesIO:
         """Read S3 object into memory as BytesIO.
@@ -194,30 +419,52 @@ class S3Utils(AWSUtils):
             key: S3 key.
             **kwargs: kwargs for `boto3.client.get_object`.
         """
+        return BytesIO(self._s3_to_stream(bucket, key, **kwargs).read())
+
+    def _s3_to_stream(self, bucket: str, key: str, **kwargs):
+        """Open S3 object as a file-like stream that is read straight from the response."""
         s3_get_kwargs = filter_kwargs(kwargs, S3_GET_KWARGS)
         s3 = self.get_s3_client()
         obj = s3.get_object(Bucket=bucket, Key=key, **s3_get_kwargs)
-        return BytesIO(obj["Body"].read())
-
-    def s3_to_file(self, bucket: str, key: str, file_name: str, **kwargs):
+        return obj["Body"]
+
+    def s3_to_file(
+        self,
+        bucket: str,
+        key: str,
+        file_name: str,
+        transfer_config: TransferConfig = None,
+        **kwargs,
+    ):
         """Download S3 object as local file.
 
         Args:
             bucket: S3 bucket name.
             key: S3 key.
             file_name: Local file name.
+            transfer_config (optional): `boto3.s3.transfer.TransferConfig` for the transfer, e.g.
+                to raise `max_concurrency` of multipart transfers of large files. Default is
+                `transfer_config` of the instance, or boto3's default configuration.
             **kwargs: kwargs for `boto3.client.download_file`.
         """
         s3_get_kwargs = filter_kwargs(kwargs, S3_GET_KWARGS)
         s3 = self.get_s3_resource()
         s3.Bucket(bucket).download_file(
-            Key=key, Filename=file_name, ExtraArgs=s3_get_kwargs
+            Key=key,
+            Filename=file_name,
+            ExtraArgs=s3_get_kwargs,
+            Config=transfer_config or self.transfer_config,
         )
 
     def s3_to_df(self, bucket: str, key: str, **kwargs):
         """Read S3 object into memory as DataFrame
 
-        Only supporting delimited files. Default is tab delimited files.
+        Only supporting delimited files and Parquet files. Default is tab delimited files. Keys
+        ending with `.parquet`, such as Redshift Parquet unloads, are read with
+        `pandas.read_parquet`, which needs pyarrow or fastparquet. Delimited objects are parsed as
+        they are streamed from S3, without first buffering the whole body in memory. With pandas
+        1.4+ and pyarrow installed, pass `engine="pyarrow"` to parse with Arrow's multithreaded
+        CSV reader.
 
         Args:
             bucket: S3 bucket name.
@@ -227,30 +474,73 @@ class S3Utils(AWSUtils):
         Returns:
             A DataFrame.
         """
-        s3_get_kwargs = filter_kwargs(kwargs, S3_GET_KWARGS)
-        read_table_kwargs = filter_kwargs(kwargs, PANDAS_READ_TABLE_KWARGS)
-        buffer = self.s3_to_obj(bucket, key, **s3_get_kwargs)
-        return pd.read_csv(buffer, **read_table_kwargs)
-
-    def s3_folder_to_df(self, bucket: str, folder: str, prefix: str = None, **kwargs):
+        s3_get_kwargs, read_table_kwargs = partition_kwargs(
+            kwargs, S3_GET_KWARGS, PANDAS_READ_TABLE_KWARGS
+        )
+        return self._s3_to_df(bucket, key, s3_get_kwargs, read_table_kwargs)
+
+    def _s3_to_df(
+        self, bucket: str, key: str, s3_get_kwargs: dict, read_table_kwargs: dict
+    ) -> pd.DataFrame:
+        stream = self._s3_to_stream(bucket, key, **s3_get_kwargs)
+        if key.endswith(".parquet"):
+            # Parquet readers need a seekable file to read the footer first
+            try:
+                buffer = BytesIO(stream.read())
+            finally:
+                stream.close()
+            return pd.read_parquet(buffer, columns=read_table_kwargs.get("usecols"))
+        try:
+            result = pd.read_csv(stream, **read_table_kwargs)
+        except BaseException:
+            stream.close()
+            raise
+        # With chunksize or iterator, the reader keeps reading from the stream lazily
+        if isinstance(result, pd.DataFrame):
+            stream.close()
+        return result
+
+    def s3_folder_to_df(
+        self,
+        bucket: str,
+        folder: str,
+        prefix: str = None,
+        max_concurrency: int = 16,
+        **kwargs,
+    ):
         """Read all files in folder with prefix to a df.
 
+        Files are downloaded concurrently and concatenated in key order. Files are read as in
+        `s3_to_df`, so folders of Parquet files are supported too. An empty DataFrame is returned
+        if no file matches.
+
         Args:
             bucket: S3 bucket name.
             folder: S3 folder.
             prefix: File prefix.
+            max_concurrency (optional): Maximum number of files downloaded at the same time.
 
         Returns:
             A DataFrame.
         """
-        s3_get_kwargs = filter_kwargs(kwargs, S3_GET_KWARGS)
-        read_table_kwargs = filter_kwargs(kwargs, PANDAS_READ_TABLE_KWARGS)
+        s3_get_kwargs, read_table_kwargs = partition_kwargs(
+            kwargs, S3_GET_KWARGS, PANDAS_READ_TABLE_KWARGS
+        )
         if folder[-1] != "/":
             folder = folder + "/"
         pattern = make_valid_uri(folder, prefix or "/")
         allfiles = [f for f in self.list_object_keys(bucket, pattern) if f != folder]
-        dfs = []
-        for f in allfiles:
+
+        def read_file(f):
             LOGGER.info(f"Reading file {f}")
-            dfs.append(self.s3_to_df(bucket, f, **s3_get_kwargs, **read_table_kwargs))
-        return pd.concat(dfs)
+            return self._s3_to_df(bucket, f, s3_get_kwargs, read_table_kwargs)
+
+        if not allfiles:
+            return pd.DataFrame()
+        if len(allfiles) == 1:
+            return read_file(allfiles[0])
+        # Create the shared client before the worker threads use it
+        self.get_s3_client()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            dfs = list(executor.map(read_file, allfiles))
+        return pd.concat(dfs, copy=False)
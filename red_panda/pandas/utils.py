@@ -1,5 +1,6 @@
-from functools import reduce
-from typing import Union, List, Dict, Callable
+from functools import partial, reduce
+from typing import Union, List, Dict, Callable, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -13,11 +14,25 @@ def merge_dfs(dfs: List[pd.DataFrame], **kwargs) -> pd.DataFrame:
     Returns:
         Merged DataFrame.
     """
-    return reduce(lambda df1, df2: pd.merge(df1, df2, **kwargs), dfs)
+    # Intermediate results are never exposed, so they need not be defensive copies
+    kwargs.setdefault("copy", False)
+    return reduce(partial(pd.merge, **kwargs), dfs)
+
+
+def _sort_codes(s: pd.Series, ascending: bool) -> np.ndarray:
+    """Integer codes that sort like `s`, so sorting avoids Python-level object comparisons.
+
+    Missing values get the code that sorts last in the given direction, as in `sort_values`.
+    """
+    codes, uniques = pd.factorize(s, sort=True)
+    return np.where(codes == -1, len(uniques) if ascending else -1, codes)
 
 
 def row_number(
-    df: pd.DataFrame, group_by: List[str], sort_by: List[str], ascending: bool = True,
+    df: pd.DataFrame,
+    group_by: List[str],
+    sort_by: List[str],
+    ascending: Union[bool, List[bool]] = True,
 ) -> pd.Series:
     """Create a row number series given a DataFrame lists of columns for group by and sort by.
     
@@ -26,7 +41,8 @@ def row_number(
         group_by: List of group by columns.
         sort_by: List of sort by columns.
         col_name (optional): The output column name.
-        ascending (optional): Whether sort in ascending order.
+        ascending (optional): Whether sort in ascending order, or a list of one such flag per
+            sort by column.
         as_series (optional): Whether to return a Series instead of a DataFrame.
 
     Returns:
@@ -36,26 +52,61 @@ def row_number(
         >>> df = row_number(df, ['group'], ['sort'], as_series=False)
         >>> df['rn'] = row_number(df, ['group'], ['sort'])
     """
-    return df.sort_values(sort_by, ascending=ascending).groupby(group_by).cumcount()
+    # Only sort the key columns instead of a copy of the whole DataFrame
+    keys = df[list(dict.fromkeys([*group_by, *sort_by]))]
+    object_sort_by = [
+        c for c in sort_by if c not in group_by and keys[c].dtype == object
+    ]
+    if object_sort_by:
+        keys = keys.copy()
+        for c in object_sort_by:
+            column_ascending = (
+                ascending[sort_by.index(c)]
+                if isinstance(ascending, (list, tuple))
+                else ascending
+            )
+            keys[c] = _sort_codes(keys[c], column_ascending)
+    return (
+        keys.sort_values(sort_by, ascending=ascending)
+        .groupby(group_by, sort=False)
+        .cumcount()
+    )
 
 
 def groupby_mutate(
     df: pd.DataFrame,
     group_by: Union[List[str], str],
-    func_dict: Dict[str, Callable],
+    func_dict: Dict[str, Union[Callable, Tuple[str, Union[str, Callable]]]],
     inplace: bool = False,
 ) -> pd.DataFrame:
     """Similar to R's dplyr::mutate.
 
+    Args:
+        df: Input DataFrame.
+        group_by: Group by column(s).
+        func_dict: New column names mapped to either a function of each group's DataFrame, or a
+            `(column, func)` tuple, where `func` is passed to `transform` on `column` of each
+            group, e.g. `("x", "sum")`. Tuples run as a single vectorized `transform` instead of
+            calling a Python function per group.
+        inplace (optional): Whether to add the new columns to `df` instead of a copy.
+
+    Returns:
+        DataFrame with the new columns.
+
     Example:
         >>> def func(x):
                 return x["x"] / sum(x["x"])
         >>> func_dict = {
-                'ratio': x["x"] / sum(x["x"])
+                'ratio': x["x"] / sum(x["x"]),
+                'total': ("x", "sum"),
             }
         >>> groupby_mutate(df, "b", func_dict)
     """
     out = df if inplace else df.copy()
     for col, func in func_dict.items():
-        out[col] = out.groupby(group_by, group_keys=False).apply(func)
+        if isinstance(func, tuple):
+            source, reducer = func
+            out[col] = out.groupby(group_by)[source].transform(reducer)
+        else:
+            out[col] = out.groupby(group_by, group_keys=False).apply(func)
     return out
@@ -5,13 +5,14 @@ from typing import Union, Optional, List
 import logging
 
 import pandas as pd
+from boto3.s3.transfer import TransferConfig
 
 from red_panda.pandas import PANDAS_TOCSV_KWARGS
 from red_panda.aws import (
-    REDSHIFT_RESERVED_WORDS,
     REDSHIFT_COPY_KWARGS,
+    is_reserved,
 )
-from red_panda.utils import filter_kwargs, make_valid_uri
+from red_panda.utils import filter_kwargs, check_kwargs, make_valid_uri
 from red_panda.aws.s3 import S3Utils
 from red_panda.aws.redshift import RedshiftUtils
 
@@ -19,28 +20,34 @@ from red_panda.aws.redshift import RedshiftUtils
 LOGGER = logging.getLogger(__name__)
 
 
+# Redshift data types by `dtype.kind`; other kinds, e.g. strings and objects, are varchar(256)
+PANDAS_KIND_REDSHIFT_TYPES = {
+    "i": "bigint",
+    "f": "double precision",
+    "b": "boolean",
+    "M": "timestamp",
+}
+
+
+def _map_type(dtype) -> str:
+    if getattr(dtype, "tz", None) is not None:
+        return "timestamptz"
+    return PANDAS_KIND_REDSHIFT_TYPES.get(dtype.kind, "varchar(256)")
+
+
 def map_types(columns_types: dict) -> dict:
     """Convert Pandas dtypes to Redshift data types.
 
+    Types are mapped by kind, so all integer, float, boolean and datetime dtypes, including the
+    nullable and timezone-aware extension dtypes, get a matching Redshift type.
+
     Args:
         cols_types: The return value of `dict(df.dtypes)`, where `df` is a Pandas Dataframe.
 
     Returns:
         dict: A `dict` of `{original column name: mapped redshift data type}`
     """
-    PANDAS_REDSHIFT_TYPES_MAP = {
-        "O": "varchar(256)",
-        "object": "varchar(256)",
-        "int64": "bigint",
-        "float64": "double precision",
-        "boolean": "boolean",
-    }
-    return {
-        c: {"data_type": PANDAS_REDSHIFT_TYPES_MAP.get(t.name)}
-        if PANDAS_REDSHIFT_TYPES_MAP.get(t.name) is not None
-        else {"data_type": "varchar(256)"}
-        for c, t in columns_types.items()
-    }
+    return {c: {"data_type": _map_type(t)} for c, t in columns_types.items()}
 
 
 def check_invalid_columns(columns: list):
@@ -52,7 +59,7 @@ def check_invalid_columns(columns: list):
     Raises:
         ValueError: If the column name is invalid.
     """
-    invalid_df_col_names = [c for c in columns if c in REDSHIFT_RESERVED_WORDS]
+    invalid_df_col_names = [c for c in columns if is_reserved(c)]
     if len(invalid_df_col_names) > 0:
         raise ValueError(f"Redshift reserved words: {invalid_df_col_names}")
 
@@ -65,6 +72,7 @@ class RedPanda(RedshiftUtils, S3Utils):
         aws_config (optional): AWS configuration.
         default_bucket (optional): Default bucket to store files.
         dryrun (optional): If True, queries will be printed instead of executed.
+        transfer_config (optional): Default `boto3.s3.transfer.TransferConfig` of S3 transfers.
     
     Attributes:
         redshift_config (dict): Redshift configuration.
@@ -78,9 +86,10 @@ class RedPanda(RedshiftUtils, S3Utils):
         aws_config: dict,
         default_bucket: str = None,
         dryrun: bool = False,
+        transfer_config: TransferConfig = None,
     ):
         RedshiftUtils.__init__(self, redshift_config, dryrun)
-        S3Utils.__init__(self, aws_config)
+        S3Utils.__init__(self, aws_config, transfer_config)
         self.default_bucket = default_bucket
 
     def s3_to_redshift(
@@ -112,6 +121,8 @@ class RedPanda(RedshiftUtils, S3Utils):
         region: str = None,
         iam_role: str = None,
         column_list: list = None,
+        file_format: str = None,
+        gzip: bool = False,
     ):
         """Load S3 file into Redshift.
 
@@ -153,11 +164,19 @@ class RedPanda(RedshiftUtils, S3Utils):
             region (optional): S3 region.
             iam_role (optional): Use IAM Role for access control.
             column_list (optional): List of columns to COPY.
-        
+            file_format (optional): CSV or PARQUET. Default is CSV. Only the authorization,
+                region and column_list options apply to PARQUET files.
+            gzip (optional): Whether the CSV file is compressed with gzip.
+
+        Raises:
+            ValueError: If file_format is not CSV or PARQUET.
+
         TODO:
             * Handle S3 client side encryption.
             * Handle COPY using manifest file.
         """
+        if file_format not in (None, "CSV", "PARQUET"):
+            raise ValueError("File format can only be CSV or PARQUET if specified.")
         if not append:
             if column_definition is None:
                 raise ValueError("column_definition cannot be None if append is False")
@@ -190,6 +209,7 @@ class RedPanda(RedshiftUtils, S3Utils):
         truncatecolumns_option = "truncatecolumns" if truncatecolumns else ""
         encoding_option = f"encoding as {encoding}" if encoding is not None else ""
         null_option = f"null as '{null}'" if null is not None else ""
+        gzip_option = "gzip" if gzip else ""
         aws_access_key_id = self.aws_config.get("aws_access_key_id")
         aws_secret_access_key = self.aws_config.get("aws_secret_access_key")
         if (
@@ -215,6 +235,19 @@ class RedPanda(RedshiftUtils, S3Utils):
         column_list_option = ""
         if column_list is not None:
             column_list_option = f"({','.join(column_list)})"
+        if file_format == "PARQUET":
+            copy_template = f"""\
+            copy {table_name} {column_list_option}
+            from '{s3_source}'
+            format as parquet
+            {access_key_id_option}
+            {secret_access_key_option}
+            {aws_token_option}
+            {iam_role_option}
+            {region_option}
+            """
+            self.run_query(copy_template)
+            return
         copy_template = f"""\
         copy {table_name} {column_list_option}
         from '{s3_source}' 
@@ -227,6 +260,7 @@ class RedPanda(RedshiftUtils, S3Utils):
         {emptyasnull_option}
         {null_option}
         {encoding_option}
+        {gzip_option}
         {explicit_ids_option}
         {fillrecord_option}
         {removequotes_option}
@@ -255,6 +289,8 @@ class RedPanda(RedshiftUtils, S3Utils):
         path: str = None,
         file_name: str = None,
         cleanup: bool = True,
+        file_format: str = None,
+        csv_engine: str = None,
         **kwargs,
     ):
         """Pandas DataFrame to Redshift table.
@@ -270,14 +306,27 @@ class RedPanda(RedshiftUtils, S3Utils):
             path (optional): S3 key excluding file name.
             file_name (optional): If None, file_name will be randomly generated.
             cleanup: (optional): Default True, S3 file will be deleted after COPY.
-            **kwargs: keyword arguments to pass to Pandas `to_csv` and Redshift COPY.
+            file_format (optional): CSV or PARQUET, the format of the intermediate S3 file. Default
+                is CSV. PARQUET files are smaller and faster to COPY, and need pyarrow or
+                fastparquet.
+            csv_engine (optional): pandas or pyarrow, the CSV writer for the intermediate S3
+                file, see `df_to_s3`.
+            **kwargs: keyword arguments to pass to Pandas `to_csv` and Redshift COPY. With
+                `compression="gzip"`, the CSV file is gzipped and loaded with COPY GZIP, which
+                makes the upload and COPY much faster for large frames.
+
+        Raises:
+            ValueError: If a keyword argument is accepted by neither `to_csv` nor COPY.
         """
         bridge_bucket = bucket or self.default_bucket
         if not bridge_bucket:
             raise ValueError("Either bucket or default_bucket must be provided.")
 
+        check_kwargs(kwargs, PANDAS_TOCSV_KWARGS, REDSHIFT_COPY_KWARGS)
         to_csv_kwargs = filter_kwargs(kwargs, PANDAS_TOCSV_KWARGS)
         copy_kwargs = filter_kwargs(kwargs, REDSHIFT_COPY_KWARGS)
+        if file_format in (None, "CSV") and to_csv_kwargs.get("compression") == "gzip":
+            copy_kwargs["gzip"] = True
 
         if column_definition is None:
             column_definition = map_types(OrderedDict(df.dtypes))
@@ -300,7 +349,14 @@ class RedPanda(RedshiftUtils, S3Utils):
             file_name = f"redpanda-{uuid.uuid4()}"
 
         s3_key = make_valid_uri(path if path is not None else "", file_name)
-        self.df_to_s3(df, bucket=bridge_bucket, key=s3_key, **to_csv_kwargs)
+        self.df_to_s3(
+            df,
+            bucket=bridge_bucket,
+            key=s3_key,
+            file_format=file_format,
+            csv_engine=csv_engine,
+            **to_csv_kwargs,
+        )
         try:
             self.s3_to_redshift(
                 bridge_bucket,
@@ -308,12 +364,43 @@ class RedPanda(RedshiftUtils, S3Utils):
                 table_name,
                 column_definition=column_definition,
                 append=append,
+                file_format=file_format,
                 **copy_kwargs,
             )
         finally:
             if cleanup:
                 self.delete_from_s3(bridge_bucket, s3_key)
 
+    def redshift_to_file(
+        self, sql: str, file_name: str, chunksize: int = None, **kwargs
+    ):
+        """Redshift query result to a file.
+
+        If `file_name` is an S3 URI (`s3://bucket/path/prefix`), the result is unloaded in
+        parallel from every slice of the cluster with `redshift_to_s3` instead of being fetched
+        through this process.
+
+        Args:
+            sql: SQL query.
+            file_name: File name of the saved file, or an S3 URI of the unloaded files' prefix.
+            chunksize (optional): See `RedshiftUtils.redshift_to_file`. Ignored for S3 URIs.
+            **kwargs: `to_csv` keyword arguments, or `redshift_to_s3` keyword arguments for S3
+                URIs.
+
+        Raises:
+            ValueError: If an S3 URI does not include a prefix.
+        """
+        if not file_name.startswith("s3://"):
+            super().redshift_to_file(sql, file_name, chunksize=chunksize, **kwargs)
+            return
+        bucket, _, key = file_name[len("s3://") :].partition("/")
+        path, _, prefix = key.rpartition("/")
+        if not prefix:
+            raise ValueError("S3 URI must end with a prefix for the unloaded files.")
+        self.redshift_to_s3(
+            sql, bucket=bucket, path=path or None, prefix=prefix, **kwargs
+        )
+
     def redshift_to_s3(
         self,
         sql: str,
@@ -519,3 +606,63 @@ class RedPanda(RedshiftUtils, S3Utils):
         {iam_role_option}
         """
         self.run_query(unload_template)
+
+    def redshift_to_df_via_s3(
+        self,
+        sql: str,
+        path: str,
+        bucket: str = None,
+        iam_role: str = None,
+        region: str = None,
+        max_concurrency: int = None,
+        cleanup: bool = True,
+    ) -> pd.DataFrame:
+        """Redshift query result to a Pandas DataFrame, unloaded through S3.
+
+        The result is unloaded as Parquet by every slice of the cluster in parallel, and the
+        files are then downloaded concurrently. For large results this is much faster than
+        fetching all rows through a single connection with `redshift_to_df`.
+
+        Args:
+            sql: SQL query.
+            path: S3 key excluding file name, where the unloaded files are written.
+            bucket (optional): S3 bucket name, fallback to `default_bucket` if not present.
+            iam_role (optional): IAM Role string for UNLOAD.
+            region (optional): AWS region if S3 region is different from Redshift region.
+            max_concurrency (optional): Maximum number of files downloaded at the same time.
+                Default is the number of slices of the cluster.
+            cleanup (optional): Default True, the unloaded S3 files will be deleted after reading.
+
+        Returns:
+            pandas.DataFrame: A DataFrame of query result.
+        """
+        bridge_bucket = bucket or self.default_bucket
+        if not bridge_bucket:
+            raise ValueError("Either bucket or default_bucket must be provided.")
+
+        import uuid
+
+        prefix = f"redpanda-{uuid.uuid4()}-"
+        self.redshift_to_s3(
+            sql,
+            bucket=bridge_bucket,
+            path=path,
+            prefix=prefix,
+            iam_role=iam_role,
+            file_format="PARQUET",
+            region=region,
+        )
+        if self._dryrun:
+            return pd.DataFrame()
+        try:
+            return self.s3_folder_to_df(
+                bridge_bucket,
+                path,
+                prefix,
+                max_concurrency=max_concurrency or self.get_num_slices() or 16,
+            )
+        finally:
+            if cleanup:
+                pattern = make_valid_uri(path.rstrip("/") + "/", prefix)
+                keys = list(self.list_object_keys(bridge_bucket, pattern))
+                self.delete_many_from_s3(bridge_bucket, keys)
@@ -1 +1,8 @@
-from red_panda.utils.utils import filter_kwargs, prettify_sql, make_valid_uri
+from red_panda.utils.utils import (
+    filter_kwargs,
+    partition_kwargs,
+    check_kwargs,
+    prettify_sql,
+    split_sql,
+    make_valid_uri,
+)
@@ -1,17 +1,98 @@
 import os
 import re
 from copy import deepcopy
+from typing import Iterable, Iterator
 
 
 def filter_kwargs(full, ref):
     return {k: v for k, v in full.items() if k in ref}
 
 
+def partition_kwargs(full, *refs):
+    """Filter keyword arguments by several references in a single pass.
+
+    Returns:
+        tuple: One `dict` per reference, with the keyword arguments in that reference.
+    """
+    parts = tuple({} for _ in refs)
+    for k, v in full.items():
+        for part, ref in zip(parts, refs):
+            if k in ref:
+                part[k] = v
+    return parts
+
+
+def check_kwargs(full, *refs):
+    """Check that every keyword argument is accepted by at least one of `refs`.
+
+    Raises:
+        ValueError: If there are keyword arguments not in any of `refs`.
+    """
+    unknown = full.keys() - frozenset().union(*refs)
+    if unknown:
+        raise ValueError(f"Unknown keyword arguments: {sorted(unknown)}")
+
+
+SQL_SECRET_RES = tuple(
+    re.compile(rf"(?<={option} \')(.*)(?=\')")
+    for option in ("access_key_id", "secret_access_key", "iam_role")
+)
+SQL_BLANK_LINES_RE = re.compile(r"\n\s*\n*")
+
+
 def prettify_sql(sql):
-    sql = re.sub(r"(?<=access_key_id \')(.*)(?=\')", "*" * 8, sql)
-    sql = re.sub(r"(?<=secret_access_key \')(.*)(?=\')", "*" * 8, sql)
-    sql = re.sub(r"(?<=iam_role \')(.*)(?=\')", "*" * 8, sql)
-    return re.sub(r"\n\s*\n*", "\n", sql.lstrip())
+    for secret_re in SQL_SECRET_RES:
+        sql = secret_re.sub("*" * 8, sql)
+    return SQL_BLANK_LINES_RE.sub("\n", sql.lstrip())
+
+
+SQL_TOKEN_RE = re.compile(r"'|\"|\$(?:[A-Za-z_]\w*)?\$|--|/\*|\*/|;")
+
+
+def split_sql(lines: Iterable[str]) -> Iterator[str]:
+    """Lazily split SQL text into statements on `;`.
+
+    Semicolons in quoted strings, quoted identifiers and dollar-quoted blocks are kept, and
+    comments are dropped.
+
+    Args:
+        lines: SQL text, e.g. an open `.sql` file.
+
+    Returns:
+        Iterator[str]: Non-empty statements without the trailing `;`.
+    """
+    statement = []
+    quote = None
+    for line in lines:
+        pos = 0
+        for m in SQL_TOKEN_RE.finditer(line):
+            token = m.group()
+            if quote is not None:
+                if token == quote:
+                    if quote == "*/":
+                        pos = m.end()
+                    quote = None
+            elif token == "--":
+                statement.append(line[pos : m.start()] + "\n")
+                pos = len(line)
+                break
+            elif token == "/*":
+                statement.append(line[pos : m.start()])
+                quote = "*/"
+            elif token == ";":
+                statement.append(line[pos : m.start()])
+                pos = m.end()
+                sql = "".join(statement).strip()
+                if sql:
+                    yield sql
+                statement = []
+            elif token != "*/":
+                quote = token
+        if quote != "*/":
+            statement.append(line[pos:])
+    sql = "".join(statement).strip()
+    if sql:
+        yield sql
 
 
 def make_valid_uri(*args):
@@ -0,0 +1,74 @@
+import pytest
+import pandas as pd
+from pyathena.pandas_cursor import PandasCursor
+
+from red_panda.aws.athena import AthenaUtils, ATHENA_CACHE_SIZE
+
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+SAMPLE_DF = pd.DataFrame([{"col0": 1}])
+
+
+@pytest.fixture
+def athena_utils(mocker):
+    mocker.patch("red_panda.aws.athena.connect")
+    return AthenaUtils({}, "s3://bucket/staging")
+
+
+def test_athena_utils_run_query(athena_utils):
+    mock_cursor = athena_utils.cursor
+    mock_cursor.description = [["col0"], ["col1"]]
+    mock_cursor.fetchmany.side_effect = [[(1, "a")], [(2, "b")], []]
+    res = athena_utils.run_query("select * from table")
+    assert res == [{"col0": 1, "col1": "a"}, {"col0": 2, "col1": "b"}]
+
+
+def test_athena_utils_use_cache_without_work_group_raises(mocker):
+    mocker.patch("red_panda.aws.athena.connect")
+    with pytest.raises(ValueError):
+        AthenaUtils({}, "s3://bucket/staging", use_cache=True)
+
+
+def test_athena_utils_run_query_use_cache_without_work_group_raises(athena_utils):
+    with pytest.raises(ValueError):
+        athena_utils.run_query("select 1", use_cache=True)
+    athena_utils.cursor.execute.assert_not_called()
+
+
+def test_athena_utils_run_query_uses_default_cache(mocker):
+    mocker.patch("red_panda.aws.athena.connect")
+    athena_utils = AthenaUtils(
+        {}, "s3://bucket/staging", work_group="primary", use_cache=True
+    )
+    athena_utils.cursor.description = [["col0"]]
+    athena_utils.cursor.fetchmany.return_value = []
+    athena_utils.run_query("select 1")
+    athena_utils.cursor.execute.assert_called_once_with(
+        "select 1", cache_size=ATHENA_CACHE_SIZE
+    )
+
+
+def test_athena_utils_arraysize(mocker):
+    mocker.patch("red_panda.aws.athena.connect")
+    athena_utils = AthenaUtils({}, "s3://bucket/staging", arraysize=500)
+    assert athena_utils.cursor.arraysize == 500
+
+
+def test_athena_utils_run_query_as_df_with_pandas_cursor(mocker):
+    mocker.patch("red_panda.aws.athena.connect")
+    athena_utils = AthenaUtils({}, "s3://bucket/staging", cursor_class=PandasCursor)
+    athena_utils.cursor = mocker.MagicMock(spec=PandasCursor)
+    athena_utils.cursor.as_pandas.return_value = SAMPLE_DF
+    assert athena_utils.run_query("select 1", as_df=True) is SAMPLE_DF
+
+
+def test_athena_utils_run_query_as_namedtuple(athena_utils):
+    mock_cursor = athena_utils.cursor
+    mock_cursor.description = [["col0"], ["col 1"]]
+    mock_cursor.fetchmany.side_effect = [[(1, "a")], []]
+    (row,) = athena_utils.run_query("select * from table", as_namedtuple=True)
+    assert row.col0 == 1
+    assert row == (1, "a")
@@ -0,0 +1,32 @@
+import pytest
+
+from red_panda.aws import (
+    REDSHIFT_RESERVED_WORDS,
+    EMPTY_AWS_CONFIG,
+    AWSUtils,
+    is_reserved,
+)
+
+
+def test_reserved_words_are_casefolded():
+    assert all(w == w.strip().casefold() for w in REDSHIFT_RESERVED_WORDS)
+
+
+@pytest.mark.parametrize("name", ["table", "TABLE", "Snapshot", "encrypt"])
+def test_is_reserved(name):
+    assert is_reserved(name)
+
+
+@pytest.mark.parametrize("name", ["col0", "tables", "encrypt     ", 0, ("a", "b")])
+def test_is_reserved_on_valid_names(name):
+    assert not is_reserved(name)
+
+
+def test_aws_utils_without_config():
+    aws_utils = AWSUtils(None)
+    assert aws_utils.aws_config is EMPTY_AWS_CONFIG
+    assert aws_utils._get_aws_credentials() == {
+        "aws_access_key_id": None,
+        "aws_secret_access_key": None,
+        "aws_session_token": None,
+    }
@@ -1,6 +1,12 @@
 import pytest
+import pandas as pd
+import psycopg2
 
-from red_panda.aws.redshift import RedshiftUtils
+from red_panda.aws.redshift import (
+    RedshiftUtils,
+    create_column_definition_single,
+    create_column_definition,
+)
 
 import logging
 
@@ -13,6 +19,55 @@ def redshift_utils():
     return RedshiftUtils({})
 
 
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ({}, "varchar(256)"),
+        ({"data_type": "bigint", "default": 0}, "bigint default 0"),
+        ({"default": "a"}, "varchar(256) default 'a'"),
+        (
+            {"data_type": "int", "identity": (0, 1), "distkey": True, "sortkey": False},
+            "int identity(0, 1) distkey",
+        ),
+        (
+            {"encode": "zstd", "nullable": False, "unique": True, "primary_key": True},
+            "varchar(256) encode zstd not null unique primary key",
+        ),
+        ({"references": "t(c)", "like": "t2"}, "varchar(256) references t(c) like t2"),
+    ],
+)
+def test_create_column_definition_single(test_input, expected):
+    assert create_column_definition_single(test_input) == expected
+
+
+def test_create_column_definition():
+    COLUMN_DEFINITION = {"a": {"data_type": "bigint"}, "b": None}
+    assert create_column_definition(COLUMN_DEFINITION) == "a bigint,\nb varchar(256)"
+
+
+def test_create_column_definition_is_cached(mocker):
+    spy = mocker.patch(
+        "red_panda.aws.redshift.create_column_definition_single",
+        wraps=create_column_definition_single,
+    )
+    COLUMN_DEFINITION = {"cached_a": {"data_type": "bigint"}, "cached_b": None}
+    create_column_definition(COLUMN_DEFINITION)
+    create_column_definition(COLUMN_DEFINITION)
+    assert spy.call_count == 2
+
+
+def test_create_column_definition_cache_keeps_value_types():
+    int_default = create_column_definition({"a": {"default": 1}})
+    float_default = create_column_definition({"a": {"default": 1.0}})
+    assert int_default == "a varchar(256) default 1"
+    assert float_default == "a varchar(256) default 1.0"
+
+
+def test_create_column_definition_unhashable_options():
+    COLUMN_DEFINITION = {"a": {"data_type": "bigint", "identity": [0, 1]}}
+    assert create_column_definition(COLUMN_DEFINITION) == "a bigint identity(0, 1)"
+
+
 def test_redshift_utils_run_query(mocker, redshift_utils):
     mock_connect = mocker.patch("psycopg2.connect").return_value
     mock_cursor = mock_connect.cursor.return_value
@@ -30,3 +85,210 @@ def test_redshift_utils_get_num_slices(mocker, redshift_utils):
     mock_cursor.fetchall.return_value = [[MOCK_NUM_SLICES]]  # Num slices
     assert redshift_utils.get_num_slices() == MOCK_NUM_SLICES
 
+
+def test_redshift_utils_get_num_slices_is_cached(mocker, redshift_utils):
+    mock_run_query = mocker.patch.object(
+        redshift_utils, "run_query", return_value=([[2]], ["num_slices"])
+    )
+    assert redshift_utils.get_num_slices() == 2
+    assert redshift_utils.get_num_slices() == 2
+    mock_run_query.assert_called_once()
+
+
+def test_redshift_utils_kill_session_passes_pid_as_parameter(mocker, redshift_utils):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_connect.return_value.closed = 0
+    redshift_utils.kill_session("123")
+    mock_connect.return_value.cursor.return_value.execute.assert_called_once_with(
+        "select pg_terminate_backend(%s)", (123,)
+    )
+
+
+def test_redshift_utils_cancel_query_passes_pid_as_parameter(mocker, redshift_utils):
+    mock_run_query = mocker.patch.object(redshift_utils, "run_query")
+    redshift_utils.cancel_query("123", transaction=True)
+    assert mock_run_query.call_args_list == [
+        mocker.call("cancel %s", params=(123,)),
+        mocker.call("abort"),
+    ]
+
+
+def test_redshift_utils_cancel_query_rejects_invalid_pid(mocker, redshift_utils):
+    mock_run_query = mocker.patch.object(redshift_utils, "run_query")
+    with pytest.raises(ValueError):
+        redshift_utils.cancel_query("1; drop table t")
+    mock_run_query.assert_not_called()
+
+
+def test_redshift_utils_invalidate_cache(mocker, redshift_utils):
+    mock_run_query = mocker.patch.object(
+        redshift_utils, "run_query", side_effect=[([[2]], None), ([[4]], None)]
+    )
+    assert redshift_utils.get_num_slices() == 2
+    redshift_utils.invalidate_cache()
+    assert redshift_utils.get_num_slices() == 4
+    assert mock_run_query.call_count == 2
+
+
+def test_redshift_utils_reuses_connection(mocker, redshift_utils):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_connect.return_value.closed = 0
+    redshift_utils.run_query("select 1")
+    redshift_utils.run_query("select 1")
+    mock_connect.assert_called_once()
+
+
+def test_redshift_utils_close(mocker, redshift_utils):
+    mock_conn = mocker.patch("psycopg2.connect").return_value
+    mock_conn.closed = 0
+    redshift_utils.run_query("select 1")
+    redshift_utils.close()
+    mock_conn.close.assert_called_once()
+
+
+def test_redshift_utils_redshift_to_df_chunked(mocker, redshift_utils):
+    mock_connect = mocker.patch("psycopg2.connect").return_value
+    mock_cursor = mock_connect.cursor.return_value.__enter__.return_value
+    mock_cursor.description = [["col0"]]
+    mock_cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+    df = redshift_utils.redshift_to_df("select * from table", chunksize=2)
+    mock_connect.cursor.assert_called_once_with(name="red_panda_chunked")
+    assert df.equals(pd.DataFrame({"col0": [1, 2, 3]}))
+
+
+def test_redshift_utils_redshift_to_df_chunked_empty(mocker, redshift_utils):
+    mock_connect = mocker.patch("psycopg2.connect").return_value
+    mock_cursor = mock_connect.cursor.return_value.__enter__.return_value
+    mock_cursor.description = [["col0"]]
+    mock_cursor.fetchmany.return_value = []
+    df = redshift_utils.redshift_to_df("select * from table", chunksize=2)
+    assert list(df.columns) == ["col0"]
+    assert df.empty
+
+
+def test_redshift_utils_redshift_to_file_chunked(mocker, redshift_utils, tmpdir):
+    mock_connect = mocker.patch("psycopg2.connect").return_value
+    mock_cursor = mock_connect.cursor.return_value.__enter__.return_value
+    mock_cursor.description = [["col0"]]
+    mock_cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+    sample_file = tmpdir / "sample.csv"
+    redshift_utils.redshift_to_file(
+        "select * from table", str(sample_file), chunksize=2
+    )
+    assert sample_file.read() == ",col0\n0,1\n1,2\n2,3\n"
+
+
+def test_redshift_utils_get_cluster_diagnostics(mocker, redshift_utils):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_cursor = mock_connect.return_value.cursor.return_value
+    mock_cursor.description = [["column_name"]]
+    mock_cursor.fetchall.return_value = [("value",)]
+    diagnostics = redshift_utils.get_cluster_diagnostics()
+    mock_connect.assert_called_once()
+    assert mock_cursor.execute.call_count == 5
+    assert list(diagnostics) == [
+        "table_info",
+        "load_errors",
+        "running_info",
+        "lock_info",
+        "transaction_info",
+    ]
+    assert diagnostics["lock_info"].equals(
+        pd.DataFrame([("value",)], columns=["column_name"])
+    )
+
+
+def test_redshift_utils_run_many(mocker, redshift_utils):
+    mock_connect = mocker.patch("psycopg2.connect").return_value
+    mock_execute_batch = mocker.patch("red_panda.aws.redshift.execute_batch")
+    SQL = "insert into table values (%s)"
+    ARGSLIST = [(1,), (2,)]
+    redshift_utils.run_many(SQL, ARGSLIST, page_size=10)
+    mock_execute_batch.assert_called_once_with(
+        mock_connect.cursor.return_value, SQL, ARGSLIST, page_size=10
+    )
+    mock_connect.commit.assert_called_once()
+
+
+def test_redshift_utils_run_query_skips_prettify_when_not_logged(
+    mocker, caplog, redshift_utils
+):
+    mocker.patch("psycopg2.connect")
+    mock_prettify_sql = mocker.patch("red_panda.aws.redshift.prettify_sql")
+    caplog.set_level(logging.WARNING, logger="red_panda.aws.redshift")
+    redshift_utils.run_query("select 1")
+    mock_prettify_sql.assert_not_called()
+
+
+def test_redshift_utils_run_template_lazy(mocker, redshift_utils):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_redshift_to_df = mocker.patch.object(redshift_utils, "redshift_to_df")
+    lazy = redshift_utils.get_lock_info(as_df="lazy")
+    mock_connect.assert_not_called()
+    lazy[["table_id", "lock_status"]].head(2)
+    mock_redshift_to_df.assert_called_once_with(
+        f"select * from (select table_id, lock_status from ({lazy.sql}) t) t limit 2"
+    )
+
+
+def test_redshift_utils_run_template_interns_strings(mocker, redshift_utils):
+    data = [("".join(["pub", "lic"]), 1), ("".join(["pub", "lic"]), 2)]
+    mocker.patch.object(redshift_utils, "run_query", return_value=(data, ["s", "n"]))
+    res, _ = redshift_utils.run_template("select 1", as_df=False)
+    assert res == data
+    assert res[0][0] is res[1][0]
+
+
+def test_redshift_utils_connects_with_dsn(mocker):
+    mock_connect = mocker.patch("psycopg2.connect")
+    redshift_utils = RedshiftUtils({"user": "user", "host": "host", "port": 5439})
+    redshift_utils.run_query("select 1")
+    mock_connect.assert_called_once_with(
+        "user=user host=host port=5439 connect_timeout=10 keepalives=1 "
+        "keepalives_idle=30"
+    )
+
+
+def test_redshift_utils_create_table(mocker, redshift_utils):
+    mock_run_query = mocker.patch.object(redshift_utils, "run_query")
+    redshift_utils.create_table(
+        "t", {"a": {"data_type": "int"}}, diststyle="even", sortkey=["a"]
+    )
+    mock_run_query.assert_called_once_with(
+        "create table t (\na int\n)\nbackup YES\ndiststyle even\nCOMPOUND sortkey(a)"
+    )
+
+
+def test_redshift_utils_run_query_cancel_rolls_back(mocker, redshift_utils):
+    mock_conn = mocker.patch("psycopg2.connect").return_value
+    mock_conn.closed = 0
+    mock_conn.cursor.return_value.execute.side_effect = KeyboardInterrupt
+    redshift_utils.run_query("select 1")
+    mock_conn.cancel.assert_called_once()
+    mock_conn.rollback.assert_called()
+
+
+def test_redshift_utils_discards_broken_connection(mocker, redshift_utils):
+    mock_connect = mocker.patch("psycopg2.connect")
+    mock_connect.return_value.closed = 0
+    mock_connect.return_value.get_transaction_status.return_value = (
+        psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+    )
+    redshift_utils.run_query("select 1")
+    mock_connect.return_value.close.assert_called_once()
+    redshift_utils.run_query("select 1")
+    assert mock_connect.call_count == 2
+
+
+def test_redshift_utils_run_sql_from_file(mocker, redshift_utils, tmpdir):
+    sql_file = tmpdir.join("test.sql")
+    sql_file.write("select 1;\nselect 2;\n")
+    mock_conn = mocker.patch("psycopg2.connect").return_value
+    mock_conn.closed = 0
+    redshift_utils.run_sql_from_file(str(sql_file))
+    mock_cursor = mock_conn.cursor.return_value
+    assert mock_cursor.execute.call_args_list == [
+        mocker.call("select 1"),
+        mocker.call("select 2"),
+    ]
+    mock_conn.commit.assert_called_once()
@@ -1,6 +1,8 @@
 import pytest
+from io import BytesIO
 from moto.s3 import mock_s3
 import boto3
+from boto3.s3.transfer import TransferConfig
 import pandas as pd
 
 from red_panda.aws.s3 import S3Utils
@@ -88,9 +90,193 @@ def test_s3_to_df(s3_utils):
     assert df.equals(SAMPLE_DF)
 
 
+@pytest.mark.parametrize("read_kwargs", [{"chunksize": 1}, {"iterator": True}])
+def test_s3_to_df_lazy_reader(s3_utils, read_kwargs):
+    key = "lazy.csv"
+    s3_utils.get_s3_client().put_object(
+        Bucket=S3_BUCKET_NAME, Key=key, Body=b"col0\n1\n1\n"
+    )
+    with s3_utils.s3_to_df(bucket=S3_BUCKET_NAME, key=key, **read_kwargs) as reader:
+        df = pd.concat(reader, ignore_index=True)
+    assert df.equals(SAMPLE_FOLDER_DF)
+
+
 def test_s3_folder_to_df(s3_utils):
     df = s3_utils.s3_folder_to_df(
         bucket=S3_BUCKET_NAME, folder=S3_FOLDER, prefix=S3_FOLDER_FILE_PREFIX
     ).reset_index(drop=True)
     assert df.equals(SAMPLE_FOLDER_DF)
 
+
+def test_s3_utils_reuses_resource(mocker):
+    mock_session = mocker.patch("boto3.Session")
+    s3_utils = S3Utils(MOCK_AWS_CONFIG)
+    assert s3_utils.get_s3_client() is s3_utils.get_s3_resource().meta.client
+    mock_session.assert_called_once_with(**MOCK_AWS_CONFIG, aws_session_token=None)
+    mock_session.return_value.resource.assert_called_once()
+
+
+def test_s3_utils_max_pool_connections():
+    s3_utils = S3Utils({"max_pool_connections": 4})
+    assert s3_utils.get_s3_client().meta.config.max_pool_connections == 4
+
+
+def test_list_object_keys_paginates(s3_utils):
+    keys = s3_utils.list_object_keys(
+        bucket=S3_BUCKET_NAME, prefix=f"{S3_FOLDER}/", page_size=1
+    )
+    assert keys == [S3_FOLDER_FILE_0, S3_FOLDER_FILE_1]
+
+
+def test_list_object_keys_without_matches(s3_utils):
+    assert s3_utils.list_object_keys(bucket=S3_BUCKET_NAME, prefix="missing/") == []
+
+
+def test_df_to_s3(s3_utils):
+    key = "df-to-s3.csv"
+    s3_utils.df_to_s3(SAMPLE_DF, bucket=S3_BUCKET_NAME, key=key, index=False)
+    content = s3_utils.s3_to_obj(bucket=S3_BUCKET_NAME, key=key).getvalue()
+    assert content == b"col0\n1\n"
+
+
+def test_df_to_s3_verify_bucket(s3_utils, mocker):
+    mock_check = mocker.patch.object(s3_utils, "_check_s3_bucket_existence")
+    s3_utils.df_to_s3(SAMPLE_DF, bucket=S3_BUCKET_NAME, key="verify.csv")
+    mock_check.assert_not_called()
+    s3_utils.df_to_s3(
+        SAMPLE_DF, bucket=S3_BUCKET_NAME, key="verify.csv", verify_bucket=True
+    )
+    mock_check.assert_called_once_with(S3_BUCKET_NAME)
+
+
+def test_s3_to_file_with_transfer_config(s3_utils, tmpdir):
+    sample_file = tmpdir / "sample-transfer-config.csv"
+    s3_utils.s3_to_file(
+        bucket=S3_BUCKET_NAME,
+        key=S3_KEY,
+        file_name=str(sample_file),
+        transfer_config=TransferConfig(max_concurrency=2),
+    )
+    assert sample_file.read() == SAMPLE_BODY
+
+
+def test_df_to_s3_uses_default_transfer_config(s3_utils, mocker):
+    transfer_config = TransferConfig(max_concurrency=2)
+    mocker.patch.object(s3_utils, "transfer_config", transfer_config)
+    mock_upload = mocker.patch.object(
+        s3_utils.get_s3_resource().meta.client, "upload_fileobj"
+    )
+    s3_utils.df_to_s3(SAMPLE_DF, bucket=S3_BUCKET_NAME, key="transfer-config.csv")
+    assert mock_upload.call_args[1]["Config"] is transfer_config
+
+
+def test_delete_many_from_s3(s3_utils, mocker):
+    mocker.patch("red_panda.aws.s3.S3_DELETE_BATCH_SIZE", 1)
+    s3_bucket_name = "test-delete-many"
+    s3_utils.create_bucket(bucket=s3_bucket_name)
+    s3 = s3_utils.get_s3_client()
+    for key in ["a", "b", "c"]:
+        s3.put_object(Bucket=s3_bucket_name, Key=key, Body=b"")
+    s3_utils.delete_many_from_s3(s3_bucket_name, ["a", "b"])
+    assert s3_utils.list_object_keys(s3_bucket_name) == ["c"]
+
+
+def test_delete_bucket(s3_utils):
+    s3_bucket_name = "test-delete-bucket"
+    s3_utils.create_bucket(bucket=s3_bucket_name)
+    s3_utils.get_s3_client().put_object(Bucket=s3_bucket_name, Key="a", Body=b"")
+    s3_utils.delete_bucket(s3_bucket_name)
+    assert s3_bucket_name not in get_bucket_names()
+
+
+def test_delete_from_s3(s3_utils, mocker):
+    mock_check = mocker.patch.object(s3_utils, "_check_s3_key_existence")
+    s3_utils.get_s3_client().put_object(Bucket=S3_BUCKET_NAME, Key="delete", Body=b"")
+    s3_utils.delete_from_s3(S3_BUCKET_NAME, "delete")
+    mock_check.assert_not_called()
+    assert "delete" not in s3_utils.list_object_keys(S3_BUCKET_NAME)
+
+
+def test_delete_from_s3_logs_client_error(s3_utils, caplog):
+    s3_utils.delete_from_s3("missing-bucket-for-delete", "delete")
+    assert "NoSuchBucket" in caplog.text
+
+
+def test_s3_to_df_parquet(s3_utils):
+    pytest.importorskip("pyarrow")
+    key = "sample.parquet"
+    buffer = BytesIO()
+    SAMPLE_DF.to_parquet(buffer)
+    s3_utils.get_s3_client().put_object(
+        Bucket=S3_BUCKET_NAME, Key=key, Body=buffer.getvalue()
+    )
+    df = s3_utils.s3_to_df(bucket=S3_BUCKET_NAME, key=key)
+    assert df.equals(SAMPLE_DF)
+
+
+def test_s3_folder_to_df_single_file(s3_utils):
+    df = s3_utils.s3_folder_to_df(
+        bucket=S3_BUCKET_NAME, folder=S3_FOLDER, prefix=f"{S3_FOLDER_FILE_PREFIX}-0"
+    )
+    assert df.equals(SAMPLE_DF)
+
+
+def test_s3_folder_to_df_no_files(s3_utils):
+    df = s3_utils.s3_folder_to_df(bucket=S3_BUCKET_NAME, folder="missing")
+    assert df.empty
+
+
+@pytest.mark.parametrize(
+    "df",
+    [pd.DataFrame({"a": range(5), "b": list("vwxyz")}), pd.DataFrame(columns=["a"])],
+)
+def test_df_to_s3_in_chunks(s3_utils, mocker, df):
+    mocker.patch("red_panda.aws.s3.CSV_CHUNK_ROWS", 2)
+    key = "df-to-s3-chunks.csv"
+    s3_utils.df_to_s3(df, bucket=S3_BUCKET_NAME, key=key, sep="|")
+    content = s3_utils.s3_to_obj(bucket=S3_BUCKET_NAME, key=key).getvalue()
+    assert content == df.to_csv(sep="|").encode()
+
+
+def test_df_to_s3_parquet(s3_utils):
+    pytest.importorskip("pyarrow")
+    key = "df-to-s3.parquet"
+    s3_utils.df_to_s3(
+        SAMPLE_DF, bucket=S3_BUCKET_NAME, key=key, file_format="PARQUET", index=False
+    )
+    assert s3_utils.s3_to_df(bucket=S3_BUCKET_NAME, key=key).equals(SAMPLE_DF)
+
+
+def test_df_to_s3_gzip(s3_utils, mocker):
+    mocker.patch("red_panda.aws.s3.CSV_CHUNK_ROWS", 1)
+    key = "df-to-s3.csv.gz"
+    s3_utils.df_to_s3(
+        SAMPLE_FOLDER_DF, S3_BUCKET_NAME, key, compression="gzip", index=False
+    )
+    df = s3_utils.s3_to_df(bucket=S3_BUCKET_NAME, key=key, compression="gzip")
+    assert df.equals(SAMPLE_FOLDER_DF)
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_df_to_s3_pyarrow_csv_engine(s3_utils, mocker, compression):
+    pytest.importorskip("pyarrow")
+    mocker.patch("red_panda.aws.s3.CSV_CHUNK_ROWS", 1)
+    key = f"df-to-s3-pyarrow-{compression}.csv"
+    df = pd.DataFrame({"col0": [1, 2], "col1": ["a,b", None]})
+    s3_utils.df_to_s3(
+        df, S3_BUCKET_NAME, key, csv_engine="pyarrow", compression=compression, sep="|"
+    )
+    result = s3_utils.s3_to_df(
+        bucket=S3_BUCKET_NAME, key=key, compression=compression, sep="|", index_col=0
+    )
+    assert result.equals(df)
+
+
+def test_df_to_s3_raises_with_invalid_csv_engine(s3_utils):
+    with pytest.raises(ValueError):
+        s3_utils.df_to_s3(SAMPLE_DF, bucket=S3_BUCKET_NAME, key="k", csv_engine="c")
+
+
+def test_df_to_s3_raises_with_invalid_file_format(s3_utils):
+    with pytest.raises(ValueError):
+        s3_utils.df_to_s3(SAMPLE_DF, bucket=S3_BUCKET_NAME, key="k", file_format="ORC")
@@ -1,3 +1,4 @@
+import pytest
 import pandas as pd
 
 from red_panda.pandas.utils import (
@@ -26,6 +27,28 @@ def test_row_number_return_series():
     assert all(row_number(df, ["group"], ["sort"]) == series)
 
 
+def test_row_number_descending_with_overlapping_columns():
+    df = pd.DataFrame({"group": [0, 0, 1], "sort": [1, 2, 3], "other": ["a", "b", "c"]})
+    series = pd.Series([1, 0, 0])
+    rn = row_number(df, ["group"], ["group", "sort"], ascending=False)
+    assert rn.sort_index().equals(series)
+
+
+@pytest.mark.parametrize(
+    "ascending,expected", [(True, [1, 0, 2, 0]), (False, [0, 1, 2, 0])]
+)
+def test_row_number_object_sort_column(ascending, expected):
+    df = pd.DataFrame({"group": [0, 0, 0, 1], "sort": ["b", "a", None, "c"]})
+    rn = row_number(df, ["group"], ["sort"], ascending=ascending)
+    assert rn.sort_index().equals(pd.Series(expected))
+
+
+def test_row_number_object_sort_column_per_column_ascending():
+    df = pd.DataFrame({"g": ["a"] * 4, "s": ["x", None, "y", "x"], "t": [1, 2, 3, 4]})
+    rn = row_number(df, ["g"], ["s", "t"], ascending=[False, True])
+    assert rn.sort_index().equals(pd.Series([1, 3, 0, 2]))
+
+
 def test_groupby_mutate():
     df = pd.DataFrame({"group": [0, 0, 1, 1], "x": [1, 1, 1, 3]})
     result = pd.DataFrame(
@@ -35,6 +58,26 @@ def test_groupby_mutate():
     assert mutated.equals(result)
 
 
+def test_groupby_mutate_transform():
+    df = pd.DataFrame({"group": [0, 0, 1, 1], "x": [1, 1, 1, 3]})
+    result = pd.DataFrame(
+        {"group": [0, 0, 1, 1], "x": [1, 1, 1, 3], "total": [2, 2, 4, 4]}
+    )
+    assert groupby_mutate(df, "group", {"total": ("x", "sum")}).equals(result)
+
+
+def test_groupby_mutate_leaves_input_unchanged():
+    df = pd.DataFrame({"group": [0, 0, 1, 1], "x": [1, 1, 1, 3]})
+    original = df.copy()
+    groupby_mutate(df, "group", {"x": ("x", "sum"), "new": ("x", "max")})
+    out = groupby_mutate(df, "group", {"new": ("x", "max")})
+    assert df.equals(original)
+    out.loc[0, "x"] = 42
+    out.iloc[1, 1] = 42
+    out["x"].values[2] = 42
+    assert df.equals(original)
+
+
 def test_groupby_mutate_inplace():
     df = pd.DataFrame({"group": [0, 0, 1, 1], "x": [1, 1, 1, 3]})
     result = pd.DataFrame(
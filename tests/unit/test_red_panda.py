@@ -1,7 +1,11 @@
 import pytest
 import numpy as np
+import pandas as pd
 
-from red_panda.red_panda import map_types, check_invalid_columns
+from red_panda import configure_logging
+from red_panda.red_panda import RedPanda, map_types, check_invalid_columns
+
+import logging
 
 
 def test_map_types():
@@ -10,7 +14,158 @@ def test_map_types():
     assert map_types(PANDAS_TYPES) == REDSHIFT_TYPES
 
 
+def test_map_types_by_kind():
+    df = pd.DataFrame(
+        {
+            "i": pd.Series([1], dtype="int32"),
+            "n": pd.Series([1], dtype="Int64"),
+            "f": [1.0],
+            "b": [True],
+            "t": pd.to_datetime(["2020-01-01"]),
+            "tz": pd.to_datetime(["2020-01-01"]).tz_localize("UTC"),
+            "s": ["a"],
+            "c": pd.Series(["a"], dtype="category"),
+        }
+    )
+    assert {c: t["data_type"] for c, t in map_types(dict(df.dtypes)).items()} == {
+        "i": "bigint",
+        "n": "bigint",
+        "f": "double precision",
+        "b": "boolean",
+        "t": "timestamp",
+        "tz": "timestamptz",
+        "s": "varchar(256)",
+        "c": "varchar(256)",
+    }
+
+
 def test_check_invalid_columns_raises():
     WITH_RESERVED_WORD = ["column"]
     with pytest.raises(ValueError):
         check_invalid_columns(WITH_RESERVED_WORD)
+
+
+def test_check_invalid_columns_is_case_insensitive():
+    WITH_RESERVED_WORD = ["id", "Table"]
+    with pytest.raises(ValueError):
+        check_invalid_columns(WITH_RESERVED_WORD)
+
+
+def test_check_invalid_columns_passes():
+    check_invalid_columns(["id", "value"])
+
+
+def test_check_invalid_columns_with_integer_labels():
+    check_invalid_columns(list(pd.DataFrame(np.zeros((2, 2))).columns))
+
+
+@pytest.mark.parametrize(
+    "file_name,path",
+    [("s3://bucket/path/to/prefix", "path/to"), ("s3://bucket/prefix", None)],
+)
+def test_redshift_to_file_unloads_s3_uri(mocker, file_name, path):
+    red_panda = RedPanda({}, None)
+    mock_redshift_to_s3 = mocker.patch.object(red_panda, "redshift_to_s3")
+    red_panda.redshift_to_file("select 1", file_name, iam_role="role")
+    mock_redshift_to_s3.assert_called_once_with(
+        "select 1", bucket="bucket", path=path, prefix="prefix", iam_role="role"
+    )
+
+
+def test_redshift_to_file_raises_without_s3_prefix():
+    red_panda = RedPanda({}, None)
+    with pytest.raises(ValueError):
+        red_panda.redshift_to_file("select 1", "s3://bucket/path/")
+
+
+def test_s3_to_redshift_parquet(mocker):
+    red_panda = RedPanda({}, None)
+    mock_run_query = mocker.patch.object(red_panda, "run_query")
+    red_panda.s3_to_redshift(
+        "bucket", "key", "t", append=True, iam_role="role", file_format="PARQUET"
+    )
+    sql = " ".join(mock_run_query.call_args[0][0].split())
+    assert sql == "copy t from 's3://bucket/key' format as parquet iam_role 'role'"
+
+
+def test_s3_to_redshift_raises_with_invalid_file_format():
+    red_panda = RedPanda({}, None)
+    with pytest.raises(ValueError):
+        red_panda.s3_to_redshift("bucket", "key", "t", append=True, file_format="ORC")
+
+
+def test_df_to_redshift_parquet(mocker):
+    red_panda = RedPanda({}, None, default_bucket="bucket")
+    mock_df_to_s3 = mocker.patch.object(red_panda, "df_to_s3")
+    mock_s3_to_redshift = mocker.patch.object(red_panda, "s3_to_redshift")
+    mocker.patch.object(red_panda, "delete_from_s3")
+    df = pd.DataFrame({"a": [1]})
+    red_panda.df_to_redshift(df, "t", file_name="f", file_format="PARQUET")
+    assert mock_df_to_s3.call_args[1]["file_format"] == "PARQUET"
+    assert mock_s3_to_redshift.call_args[1]["file_format"] == "PARQUET"
+
+
+def test_df_to_redshift_gzip(mocker):
+    red_panda = RedPanda({}, None, default_bucket="bucket")
+    mocker.patch.object(red_panda, "df_to_s3")
+    mock_run_query = mocker.patch.object(red_panda, "run_query")
+    mocker.patch.object(red_panda, "delete_from_s3")
+    df = pd.DataFrame({"a": [1]})
+    red_panda.df_to_redshift(
+        df, "t", file_name="f", append=True, iam_role="role", compression="gzip"
+    )
+    assert "\ngzip\n" in "\n".join(mock_run_query.call_args[0][0].split())
+
+
+def test_df_to_redshift_parquet_column_order_matches_ddl(mocker):
+    pq = pytest.importorskip("pyarrow.parquet")
+    red_panda = RedPanda({}, {"aws_access_key_id": "id"}, default_bucket="bucket")
+    mock_s3 = mocker.patch.object(red_panda, "_connect_s3").return_value
+    mock_create_table = mocker.patch.object(red_panda, "create_table")
+    mocker.patch.object(red_panda, "run_query")
+    mocker.patch.object(red_panda, "delete_from_s3")
+    df = pd.DataFrame({"a": [1], "b": ["x"]})
+    red_panda.df_to_redshift(df, "t", file_name="f", file_format="PARQUET")
+    buffer = mock_s3.meta.client.upload_fileobj.call_args[0][0]
+    column_definition = mock_create_table.call_args[0][1]
+    assert pq.read_schema(buffer).names == list(column_definition)
+
+
+def test_df_to_redshift_rejects_gzip_without_compression(mocker):
+    red_panda = RedPanda({}, None, default_bucket="bucket")
+    mock_df_to_s3 = mocker.patch.object(red_panda, "df_to_s3")
+    with pytest.raises(ValueError):
+        red_panda.df_to_redshift(pd.DataFrame({"a": [1]}), "t", gzip=True)
+    mock_df_to_s3.assert_not_called()
+
+
+def test_redshift_to_df_via_s3(mocker):
+    red_panda = RedPanda({}, None)
+    mock_redshift_to_s3 = mocker.patch.object(red_panda, "redshift_to_s3")
+    mocker.patch.object(red_panda, "get_num_slices", return_value=4)
+    mock_s3_folder_to_df = mocker.patch.object(
+        red_panda, "s3_folder_to_df", return_value=pd.DataFrame({"a": [1]})
+    )
+    mock_list_object_keys = mocker.patch.object(
+        red_panda, "list_object_keys", return_value=iter(["path/p0.parquet"])
+    )
+    mock_delete_many_from_s3 = mocker.patch.object(red_panda, "delete_many_from_s3")
+    df = red_panda.redshift_to_df_via_s3("select 1", "path", bucket="bucket")
+    assert df.equals(pd.DataFrame({"a": [1]}))
+    prefix = mock_redshift_to_s3.call_args[1]["prefix"]
+    assert mock_redshift_to_s3.call_args[1]["file_format"] == "PARQUET"
+    mock_s3_folder_to_df.assert_called_once_with(
+        "bucket", "path", prefix, max_concurrency=4
+    )
+    mock_list_object_keys.assert_called_once_with("bucket", f"path/{prefix}")
+    mock_delete_many_from_s3.assert_called_once_with("bucket", ["path/p0.parquet"])
+
+
+def test_configure_logging_is_idempotent(mocker):
+    logger = logging.getLogger("red_panda")
+    mocker.patch.object(logger, "handlers", list(logger.handlers))
+    mocker.patch.object(logger, "level", logger.level)
+    configure_logging()
+    configure_logging(logging.DEBUG)
+    assert len(logger.handlers) == 2  # NullHandler and the stream handler
+    assert logger.level == logging.DEBUG
@@ -1,7 +1,14 @@
 import pytest
 import logging
 
-from red_panda.utils import filter_kwargs, prettify_sql, make_valid_uri
+from red_panda.utils import (
+    filter_kwargs,
+    partition_kwargs,
+    check_kwargs,
+    prettify_sql,
+    split_sql,
+    make_valid_uri,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -13,6 +20,26 @@ def test_filter_kwargs():
     assert filter_kwargs(KWARGS, FILTER) == FILTERED
 
 
+def test_partition_kwargs():
+    KWARGS = {"a": 1, "b": 2, "c": 3}
+    assert partition_kwargs(KWARGS, ["a"], frozenset(["b", "c"]), []) == (
+        {"a": 1},
+        {"b": 2, "c": 3},
+        {},
+    )
+
+
+def test_check_kwargs():
+    KWARGS = {"a": 1, "b": 2}
+    check_kwargs(KWARGS, frozenset(["a"]), ["b"])
+
+
+def test_check_kwargs_raises_with_unknown_kwargs():
+    KWARGS = {"a": 1, "b": 2}
+    with pytest.raises(ValueError, match="'b'"):
+        check_kwargs(KWARGS, frozenset(["a"]))
+
+
 def test_prettify_sql_formats_properly():
     SQL = """\
     create table as
@@ -25,6 +52,26 @@ def test_prettify_sql_formats_properly():
     assert prettify_sql(SQL) == PRETTIFIED
 
 
+def test_prettify_sql_masks_credentials():
+    SQL = "copy t\naccess_key_id 'key'\nsecret_access_key 'secret'"
+    PRETTIFIED = "copy t\naccess_key_id '********'\nsecret_access_key '********'"
+    assert prettify_sql(SQL) == PRETTIFIED
+
+
+def test_split_sql():
+    SQL = """\
+    select ';', "a;b"; -- comment;
+    select $$;$$, $tag$ $$; $tag$; /* comment;
+    comment */ select 1
+    """
+    STATEMENTS = [
+        "select ';', \"a;b\"",
+        "select $$;$$, $tag$ $$; $tag$",
+        "select 1",
+    ]
+    assert list(split_sql(SQL.splitlines(keepends=True))) == STATEMENTS
+
+
 def test_make_valid_uri_raises_with_invalid_args():
     with pytest.raises(ValueError):
         make_valid_uri(["1"])